@@ -16,12 +16,80 @@ class Settings(BaseSettings):
     MYSQL_PASSWORD: str = "your_db_password"
     MYSQL_DATABASE: str = "research_hub"
 
+    # ── Read replicas (optional) ──────────────────────────────────────────────
+    # Comma-separated host[:port] list; same credentials/database as the primary.
+    # GET requests read from a healthy replica; writes always go to the primary.
+    MYSQL_REPLICA_HOSTS: Any = []
+    READ_YOUR_WRITES_SECONDS: int = 5
+    REPLICA_HEALTH_INTERVAL_SECONDS: int = 10
+
+    # ── SQLite (used when MySQL isn't configured: single-node sites, local dev) ──
+    # ":memory:" keeps everything in one shared in-process connection.
+    SQLITE_PATH: str = "./research_hub_dev.db"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_MB: int = 64
+    SQLITE_MMAP_SIZE_MB: int = 256
+    SQLITE_POOL_SIZE: int = 8
+
     # ── Redis (Amazon ElastiCache) ────────────────────────────────────────────
     # ADD YOUR ELASTICACHE ENDPOINT BELOW (e.g. myredis.xxxx.cache.amazonaws.com)
     REDIS_HOST: str = "YOUR_ELASTICACHE_ENDPOINT_HERE"
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: str = ""
 
+    # ── Read cache (Redis when configured, otherwise a per-process LRU) ───────
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_LOCAL_MAX_ENTRIES: int = 1024
+    # The per-process LRU only sees its own worker's invalidations: it keeps
+    # entries briefly and is switched off when WEB_CONCURRENCY (the worker
+    # count uvicorn and gunicorn read) is above 1
+    CACHE_LOCAL_TTL_SECONDS: int = 5
+    WEB_CONCURRENCY: int = 1
+
+    # ── Circuit breakers for Pinecone, Groq and Redis ─────────────────────────
+    # A breaker opens when BREAKER_FAILURE_RATE of at least BREAKER_MIN_CALLS
+    # calls in the last BREAKER_WINDOW_SECONDS failed or were slower than the
+    # dependency's threshold, then fails fast for BREAKER_OPEN_SECONDS.
+    BREAKER_FAILURE_RATE: float = 0.5
+    BREAKER_MIN_CALLS: int = 5
+    BREAKER_WINDOW_SECONDS: float = 30.0
+    BREAKER_OPEN_SECONDS: float = 15.0
+    PINECONE_SLOW_CALL_MS: float = 3000
+    PINECONE_TIMEOUT_SECONDS: float = 10.0
+    GROQ_SLOW_FIRST_TOKEN_MS: float = 10000
+    REDIS_SLOW_CALL_MS: float = 500
+    REDIS_TIMEOUT_SECONDS: float = 1.0
+    # Degraded-mode buffers, replayed every DEGRADED_REPLAY_INTERVAL_SECONDS
+    VECTOR_QUEUE_MAX: int = 10000
+    CHAT_HISTORY_BUFFER_MAX_SESSIONS: int = 1000
+    DEGRADED_REPLAY_INTERVAL_SECONDS: float = 10.0
+
+    # ── Response compression (Brotli when the optional package is installed) ──
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 5
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # ── Query instrumentation ─────────────────────────────────────────────────
+    # Per-request query counts/time (Server-Timing header), a slow-query log
+    # and N+1 warnings for statements repeated within one request.
+    DB_METRICS_ENABLED: bool = True
+    DB_SLOW_QUERY_MS: int = 200
+    DB_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # ── Profiling ─────────────────────────────────────────────────────────────
+    # Admins can profile any request by sending "X-Profile: 1"; requests slower
+    # than PROFILE_SLOW_MS (0 disables) and a PROFILE_SAMPLE_RATE fraction of
+    # all requests are profiled automatically. Profiles are collapsed stacks,
+    # the newest PROFILE_MAX_FILES kept in PROFILE_DIR.
+    PROFILE_ENABLED: bool = True
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_SLOW_MS: int = 2000
+    PROFILE_INTERVAL_MS: float = 5.0
+    PROFILE_DIR: str = "./profiles"
+    PROFILE_MAX_FILES: int = 50
+
     # ── JWT ───────────────────────────────────────────────────────────────────
     JWT_SECRET_KEY: str = "change-this-to-a-long-random-secret-key"
     JWT_ALGORITHM: str = "HS256"
@@ -30,19 +98,34 @@ class Settings(BaseSettings):
     # ── Pinecone ──────────────────────────────────────────────────────────────
     PINECONE_API_KEY: str = "your_pinecone_api_key"
     PINECONE_INDEX_NAME: str = "research-hub"
+    # Per-project summary vectors for two-stage retrieval live in their own
+    # namespace of the same index; chat searches the top RETRIEVAL_PROJECTS
+    # projects' chunks. Summaries are re-embedded this long after a write.
+    PINECONE_SUMMARY_NAMESPACE: str = "project-summaries"
+    RETRIEVAL_PROJECTS: int = 3
+    SUMMARY_REFRESH_DELAY_SECONDS: float = 2.0
 
     # ── Groq ──────────────────────────────────────────────────────────────────
     GROQ_API_KEY: str = "your_groq_api_key"
     GROQ_MODEL: str = "llama-3.1-70b-versatile"
+    # Answer backends tried after GROQ_MODEL, in order. A backend that has not
+    # streamed a token within LLM_FIRST_TOKEN_DEADLINE_SECONDS is hedged with
+    # the next one; the first to produce a token wins. 0 disables hedging
+    # (the next backend is then only used when one fails).
+    GROQ_FALLBACK_MODELS: Any = []
+    # Smaller/faster model for rewriting follow-ups into standalone questions;
+    # empty means GROQ_MODEL
+    GROQ_CONTEXTUALIZE_MODEL: str = ""
+    LLM_FIRST_TOKEN_DEADLINE_SECONDS: float = 3.0
 
     # ── CORS ──────────────────────────────────────────────────────────────────
     # Using Any so pydantic-settings passes the raw string to our validator
     # instead of trying to JSON-decode it first (which breaks comma-separated values).
     CORS_ORIGINS: Any = ["http://localhost:5173", "http://localhost:3000"]
 
-    @field_validator("CORS_ORIGINS", mode="before")
+    @field_validator("CORS_ORIGINS", "MYSQL_REPLICA_HOSTS", "GROQ_FALLBACK_MODELS", mode="before")
     @classmethod
-    def parse_cors(cls, v: Any) -> List[str]:
+    def parse_list(cls, v: Any) -> List[str]:
         if isinstance(v, list):
             return v
         if isinstance(v, str):
@@ -55,6 +138,15 @@ class Settings(BaseSettings):
             return [o.strip() for o in v.split(",") if o.strip()]
         return v
 
+    @property
+    def redis_configured(self) -> bool:
+        return bool(self.REDIS_HOST) and not self.REDIS_HOST.upper().startswith("YOUR_")
+
+    @property
+    def redis_url(self) -> str:
+        auth = f":{self.REDIS_PASSWORD}@" if self.REDIS_PASSWORD else ""
+        return f"redis://{auth}{self.REDIS_HOST}:{self.REDIS_PORT}/0"
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,7 +1,17 @@
+import itertools
 import logging
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import Request, Response
+from sqlalchemy import DateTime, create_engine, event, inspect, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import StaticPool
 from .config import settings
+from .services.db_metrics_service import InstrumentedQueuePool, instrument_engine
 
 logger = logging.getLogger(__name__)
 
@@ -9,7 +19,14 @@ MYSQL_URL = (
     f"mysql+pymysql://{settings.MYSQL_USER}:{settings.MYSQL_PASSWORD}"
     f"@{settings.MYSQL_HOST}:{settings.MYSQL_PORT}/{settings.MYSQL_DATABASE}"
 )
-SQLITE_URL = "sqlite:///./research_hub_dev.db"
+SQLITE_URL = (
+    "sqlite://" if settings.SQLITE_PATH == ":memory:" else f"sqlite:///{settings.SQLITE_PATH}"
+)
+
+# Cookie marking a client that wrote recently; its reads stay on the primary
+# until it expires so it never sees replica lag on its own changes.
+STICKY_COOKIE = "rh_read_primary"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
 
 
 def _try_mysql() -> bool:
@@ -28,30 +45,245 @@ def _try_mysql() -> bool:
         return False
 
 
-if _try_mysql():
-    DATABASE_URL = MYSQL_URL
-    engine = create_engine(
-        MYSQL_URL,
+def _mysql_engine(url: str) -> Engine:
+    return create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
         pool_pre_ping=True,
         pool_recycle=3600,
         pool_size=10,
         max_overflow=20,
     )
+
+
+def _sqlite_engine(url: str) -> Engine:
+    """SQLite tuned for a single node.
+
+    WAL lets any number of pooled reader connections run alongside the one
+    writer SQLite admits at a time; other writers queue on the busy timeout
+    instead of failing with "database is locked". pysqlite's own transaction
+    handling is kept on purpose: it opens the transaction at the first
+    INSERT/UPDATE/DELETE, so the write lock is only held from a request's
+    first write to its commit, not while it authenticates and loads rows.
+    """
+    memory = url == "sqlite://"
+    sqlite_engine = create_engine(
+        url,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+        # An in-memory database exists per connection, so it must be shared
+        **({"poolclass": StaticPool} if memory else {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": settings.SQLITE_POOL_SIZE,
+            "max_overflow": settings.SQLITE_POOL_SIZE,
+        }),
+    )
+
+    @event.listens_for(sqlite_engine, "connect")
+    def _configure(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not memory:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            # Durable at checkpoints rather than on every commit; safe with WAL
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024}")
+        cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_MB * 1024}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    return sqlite_engine
+
+
+class ReplicaSet:
+    """Round-robin over the replica engines currently considered healthy.
+
+    A replica is taken out of rotation as soon as it raises a connection
+    error and only re-admitted once ``check_health`` can reach it again, so
+    reads fail over to the primary instead of retrying a dead host.
+    """
+
+    def __init__(self, engines: dict[str, Engine]):
+        self.engines = engines
+        self._healthy = set(engines)
+        self._cycle = itertools.cycle(list(engines))
+        self._lock = threading.Lock()
+        for host, replica in engines.items():
+            event.listen(replica, "handle_error", self._on_error(host))
+
+    def _on_error(self, host: str):
+        def handle_error(context):
+            # connection is None when the failure happened while connecting
+            if context.is_disconnect or context.connection is None:
+                self.mark_down(host, context.original_exception)
+        return handle_error
+
+    def choose(self) -> Optional[Engine]:
+        with self._lock:
+            for _ in range(len(self.engines)):
+                host = next(self._cycle)
+                if host in self._healthy:
+                    return self.engines[host]
+        return None
+
+    def mark_down(self, host: str, exc: Exception) -> None:
+        with self._lock:
+            if host in self._healthy:
+                self._healthy.discard(host)
+                logger.warning("Read replica %s marked down, reads fail over to primary: %s", host, exc)
+
+    def check_health(self) -> None:
+        for host, replica in self.engines.items():
+            try:
+                with replica.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            except Exception as exc:
+                self.mark_down(host, exc)
+                continue
+            with self._lock:
+                if host not in self._healthy:
+                    self._healthy.add(host)
+                    logger.info("Read replica %s healthy again", host)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {host: host in self._healthy for host in self.engines}
+
+
+if _try_mysql():
+    DATABASE_URL = MYSQL_URL
+    engine = _mysql_engine(MYSQL_URL)
     logger.info("Connected to MySQL: %s", settings.MYSQL_HOST)
+    replicas = ReplicaSet({
+        host: _mysql_engine(
+            f"mysql+pymysql://{settings.MYSQL_USER}:{settings.MYSQL_PASSWORD}"
+            f"@{host if ':' in host else f'{host}:{settings.MYSQL_PORT}'}/{settings.MYSQL_DATABASE}"
+        )
+        for host in settings.MYSQL_REPLICA_HOSTS
+    })
+    if replicas.engines:
+        logger.info("Read replicas: %s", ", ".join(replicas.engines))
 else:
     DATABASE_URL = SQLITE_URL
-    engine = create_engine(SQLITE_URL, connect_args={"check_same_thread": False})
-    logger.info("Using SQLite (local development)")
+    engine = _sqlite_engine(SQLITE_URL)
+    replicas = ReplicaSet({})
+    logger.info("Using SQLite at %s", settings.SQLITE_PATH)
+
+if settings.DB_METRICS_ENABLED:
+    for instrumented in (engine, *replicas.engines.values()):
+        instrument_engine(instrumented)
+
+
+class RoutingSession(Session):
+    """Sends a read-only session's queries to one replica, everything else to the primary.
+
+    A session is read-only when created with ``info={"read_only": True}``;
+    it pins the first replica it gets so a request sees one consistent
+    snapshot. Flushes always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get("read_only") and not self._flushing:
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = replicas.choose() or engine
+            return replica
+        return engine
+
+
+def use_primary(db: Session) -> None:
+    """Send ``db``'s remaining queries to the primary, for reads whose result
+    outlives the request (a cache fill) and so must not come from a lagging
+    replica."""
+    db.info["read_only"] = False
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RoutingSession)
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def get_db():
-    db = SessionLocal()
+# Row timestamps keep microseconds: the ETag probes compare them, so two
+# writes within one second must not look alike. MySQL's DATETIME drops the
+# fraction unless declared with a precision.
+Timestamp = DateTime(timezone=True).with_variant(mysql.DATETIME(timezone=True, fsp=6), "mysql")
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def ensure_indexes(bind: Engine = engine) -> list[str]:
+    """Create model indexes missing from tables that already exist.
+
+    ``create_all`` only creates indexes together with a new table, so indexes
+    added to models later never reach existing databases. Each missing index
+    is created on its own; on MySQL/InnoDB adding a secondary index is an
+    online operation, so writes keep flowing while it builds. Another worker
+    winning the race to create the same index is not an error.
+    """
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in present:
+                continue
+            try:
+                index.create(bind=bind, checkfirst=True)
+            except Exception as exc:
+                if index.name in {ix["name"] for ix in inspect(bind).get_indexes(table.name)}:
+                    continue
+                logger.warning("Could not create index %s: %s", index.name, exc)
+                continue
+            logger.info("Created index %s on %s", index.name, table.name)
+            created.append(index.name)
+    return created
+
+
+def whole_second_timestamps(bind: Engine = engine) -> list[str]:
+    """``Timestamp`` columns an existing MySQL table still stores in whole
+    seconds. ``create_all`` never alters a column, and widening one rebuilds
+    the table, so this only reports them for an operator to ALTER."""
+    if bind.dialect.name != "mysql":
+        return []
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    found = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        declared = {c.name for c in table.columns if c.type is Timestamp}
+        for column in inspector.get_columns(table.name):
+            if column["name"] in declared and not getattr(column["type"], "fsp", None):
+                found.append(f"{table.name}.{column['name']}")
+    return found
+
+
+def get_db(request: Request, response: Response):
+    """Request-scoped session; GETs read from a replica unless the client wrote recently."""
+    read_only = False
+    if replicas.engines:
+        if request.method in SAFE_METHODS:
+            sticky_until = request.cookies.get(STICKY_COOKIE, "")
+            read_only = not (sticky_until.isdigit() and int(sticky_until) > time.time())
+        else:
+            response.set_cookie(
+                STICKY_COOKIE,
+                str(int(time.time()) + settings.READ_YOUR_WRITES_SECONDS),
+                max_age=settings.READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite="lax",
+            )
+
+    db = SessionLocal(info={"read_only": read_only})
     try:
         yield db
     finally:
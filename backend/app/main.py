@@ -1,26 +1,74 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from .config import settings
-from .database import Base, engine
-from .routers import auth, users, projects, experiments, chat
+from .database import Base, engine, ensure_indexes, replicas, whole_second_timestamps
+from .routers import auth, users, projects, experiments, chat, export, stats, profiles, metrics
+from .services import pinecone_service
+from .services.breaker_service import breaker_status
+from .services.chat_service import flush_history_buffer, history_buffer
+from .services.compression_service import CompressionMiddleware
+from .services.db_metrics_service import QueryStatsMiddleware
+from .services.pinecone_service import pending_writes, replay_pending_writes
+from .services.profiling_service import ProfilingMiddleware
+from .services.retrieval_service import summary_refresher
 
 logger = logging.getLogger(__name__)
 
 
+async def _replica_health_loop():
+    """Re-check replicas periodically so failed ones rejoin the read rotation."""
+    while True:
+        await asyncio.sleep(settings.REPLICA_HEALTH_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(replicas.check_health)
+        except Exception as exc:
+            logger.warning("Replica health check failed: %s", exc)
+
+
+async def _degraded_replay_loop():
+    """Replay vector writes and chat turns deferred while Pinecone or Redis was down."""
+    while True:
+        await asyncio.sleep(settings.DEGRADED_REPLAY_INTERVAL_SECONDS)
+        try:
+            await replay_pending_writes()
+            await flush_history_buffer()
+        except Exception as exc:
+            logger.warning("Replaying deferred writes failed: %s", exc)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: attempt table creation (fails gracefully if DB unreachable)
     try:
         Base.metadata.create_all(bind=engine)
+        ensure_indexes(engine)
         logger.info("Database tables verified/created")
+        legacy = whole_second_timestamps(engine)
+        if legacy:
+            logger.warning(
+                "Timestamps stored in whole seconds, so ETags may miss writes within one second; "
+                "ALTER them to DATETIME(6): %s", ", ".join(legacy),
+            )
     except Exception as exc:
         logger.warning(
             "Could not connect to database on startup (expected if RDS endpoint not yet set): %s", exc
         )
+    # Load the embedding model before serving, off the event loop
+    try:
+        await run_in_threadpool(pinecone_service.get_embeddings)
+    except Exception as exc:
+        logger.warning("Could not load the embedding model on startup: %s", exc)
+    summary_refresher.bind(asyncio.get_running_loop())
+    health_task = asyncio.create_task(_replica_health_loop()) if replicas.engines else None
+    replay_task = asyncio.create_task(_degraded_replay_loop())
     yield
-    # Shutdown: nothing to clean up
+    replay_task.cancel()
+    if health_task is not None:
+        health_task.cancel()
 
 
 app = FastAPI(
@@ -32,6 +80,9 @@ app = FastAPI(
     redoc_url="/api/redoc",
 )
 
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ProfilingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -45,8 +96,23 @@ app.include_router(users.router, prefix="/api")
 app.include_router(projects.router, prefix="/api")
 app.include_router(experiments.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
+app.include_router(export.router, prefix="/api")
+app.include_router(stats.router, prefix="/api")
+app.include_router(profiles.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
 
 
 @app.get("/api/health", tags=["Health"])
 def health():
-    return {"status": "healthy", "service": settings.APP_NAME}
+    dependencies = breaker_status()
+    degraded = any(b["state"] != "closed" for b in dependencies.values())
+    body = {
+        "status": "degraded" if degraded else "healthy",
+        "service": settings.APP_NAME,
+        "dependencies": dependencies,
+        "queued_vector_writes": len(pending_writes),
+        "buffered_chat_sessions": len(history_buffer),
+    }
+    if replicas.engines:
+        body["read_replicas"] = replicas.status()
+    return body
@@ -1,18 +1,24 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-from ..database import Base
+from ..database import Base, Timestamp, utcnow
 
 
 class Experiment(Base):
     __tablename__ = "experiments"
+    __table_args__ = (
+        # A project's experiments newest first, and the per-project count/max
+        # probes; also serves as the project_id foreign key index
+        Index("ix_experiments_project_id_created_at", "project_id", "created_at"),
+        # Latest edit per project for the collection validator probe
+        Index("ix_experiments_project_id_updated_at", "project_id", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     title = Column(String(255), nullable=False)
     log_text = Column(Text, nullable=True)
     results_text = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(Timestamp, default=utcnow)
+    updated_at = Column(Timestamp, onupdate=utcnow)
 
     project = relationship("Project", back_populates="experiments")
@@ -1,8 +1,7 @@
 import enum
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-from ..database import Base
+from ..database import Base, Timestamp, utcnow
 
 
 class ProjectStatus(str, enum.Enum):
@@ -14,14 +13,24 @@ class ProjectStatus(str, enum.Enum):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Dashboard list: ORDER BY created_at DESC
+        Index("ix_projects_created_at", "created_at"),
+        # Status breakdowns and status-filtered listings in creation order
+        Index("ix_projects_status_created_at", "status", "created_at", "id"),
+        # Ownership lookups (user deletion); SQLite doesn't index foreign keys
+        Index("ix_projects_user_id", "user_id"),
+        # Latest edit for the collection validator probe
+        Index("ix_projects_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     status = Column(Enum(ProjectStatus), default=ProjectStatus.active, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(Timestamp, default=utcnow)
+    updated_at = Column(Timestamp, onupdate=utcnow)
 
     owner = relationship("User", back_populates="projects")
     experiments = relationship(
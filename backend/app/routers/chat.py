@@ -2,7 +2,7 @@ import json
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 from ..schemas.chat import ChatRequest
-from ..services.chat_service import stream_chat_response
+from ..services.chat_service import DegradedNotice, stream_chat_response
 from ..dependencies import get_current_user
 from ..models.user import User
 
@@ -26,7 +26,10 @@ async def chat_stream(
                 message=request.message,
                 session_id=request.session_id,
             ):
-                yield f"data: {json.dumps({'content': chunk})}\n\n"
+                if isinstance(chunk, DegradedNotice):
+                    yield f"data: {json.dumps({'degraded': chunk.missing})}\n\n"
+                else:
+                    yield f"data: {json.dumps({'content': chunk})}\n\n"
         except Exception as exc:
             yield f"data: {json.dumps({'error': str(exc)})}\n\n"
         finally:
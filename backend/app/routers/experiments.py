@@ -1,30 +1,95 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 from ..database import get_db
-from ..schemas.experiment import ExperimentCreate, ExperimentUpdate, ExperimentResponse
+from ..schemas.experiment import (
+    BulkImportResult,
+    BulkRowResult,
+    ExperimentCreate,
+    ExperimentUpdate,
+    ExperimentResponse,
+)
 from ..models.experiment import Experiment
 from ..models.project import Project
 from ..models.user import User, UserRole
-from ..services.pinecone_service import upsert_text, delete_documents
+from ..services.pinecone_service import upsert_text, upsert_texts, delete_documents
+from ..services.ingest_service import UploadError, parse_records
+from ..services.etag_service import (
+    collection_version,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    row_validators,
+    validator_headers,
+)
+from ..services.cache_service import cached_json_response, invalidate
+from ..services.retrieval_service import summary_refresher
+from ..services.serialization_service import dumps, response_columns, row_dict, rows_json
 from ..dependencies import get_current_user
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["Experiments"])
 
+# Rows inserted per transaction by the bulk endpoint; each committed chunk is
+# embedded as one batch while the next chunk is parsed and inserted.
+BULK_CHUNK_ROWS = 500
+
+_RESPONSE_COLUMNS = response_columns(Experiment, ExperimentResponse)
+
+
+def _list_validators(db: Session, project_id: int, skip: int = 0, limit: Optional[int] = None):
+    """ETag/Last-Modified for a project's experiments from one aggregate probe."""
+    version, last_modified = collection_version(db, Experiment, Experiment.project_id == project_id)
+    return make_etag("experiments", project_id, *version, skip, limit), last_modified
+
 
 @router.get("/projects/{project_id}/experiments", response_model=List[ExperimentResponse])
 def list_experiments(
     project_id: int,
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    if not db.query(Project).filter(Project.id == project_id).first():
-        raise HTTPException(status_code=404, detail="Project not found")
-    return (
-        db.query(Experiment)
-        .filter(Experiment.project_id == project_id)
-        .order_by(Experiment.created_at.desc())
-        .all()
+    def probe():
+        if not db.query(Project.id).filter(Project.id == project_id).first():
+            raise HTTPException(status_code=404, detail="Project not found")
+        return _list_validators(db, project_id, skip, limit)
+
+    def load() -> bytes:
+        query = (
+            db.query(*_RESPONSE_COLUMNS)
+            .filter(Experiment.project_id == project_id)
+            .order_by(Experiment.created_at.desc())
+            .offset(skip)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return rows_json(query, ExperimentResponse)
+
+    if skip == 0:
+        return cached_json_response(
+            request,
+            db,
+            f"experiments:list:{project_id}:{limit or 'all'}",
+            [f"experiments:{project_id}"],
+            probe=probe,
+            load=load,
+        )
+
+    etag, last_modified = probe()
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    return Response(
+        content=load(), media_type="application/json", headers=validator_headers(etag, last_modified)
     )
 
 
@@ -52,6 +117,7 @@ async def create_experiment(
     db.add(experiment)
     db.commit()
     db.refresh(experiment)
+    invalidate(f"experiments:{project_id}", "stats")
 
     base_meta = {
         "user_id": current_user.id,
@@ -75,19 +141,178 @@ async def create_experiment(
             metadata={**base_meta, "content_type": "experiment_results"},
         )
 
+    summary_refresher.mark(project_id)
     return experiment
 
 
+def _insert_chunk(db: Session, project_id: int, payloads: list[ExperimentCreate]) -> list[int]:
+    """Insert one chunk in a single transaction and return the new ids, in order.
+
+    A Core insert rather than ORM objects: the ORM would need each row's
+    generated id back and so insert one row per statement. Where the dialect
+    can return ids from a batched insert (SQLite) they come back through
+    RETURNING; otherwise (MySQL) the chunk is one multi-row INSERT, whose
+    auto-increment ids are consecutive from ``lastrowid``. Either way ids are
+    allocated in row order, so ascending ids line up with ``payloads``.
+    """
+    table = Experiment.__table__
+    rows = [
+        {
+            "project_id": project_id,
+            "title": payload.title,
+            "log_text": payload.log_text,
+            "results_text": payload.results_text,
+        }
+        for payload in payloads
+    ]
+    try:
+        if db.get_bind().dialect.insert_executemany_returning:
+            # Not sort_by_parameter_order: without a sentinel column SQLite
+            # would fall back to one INSERT per row to honour it
+            ids = sorted(db.scalars(insert(table).returning(table.c.id), rows))
+        else:
+            first_id = db.execute(insert(table).values(rows)).lastrowid
+            ids = list(range(first_id, first_id + len(rows)))
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+    return ids
+
+
+def _documents(
+    created: list[tuple[int, ExperimentCreate]], base_meta: dict
+) -> list[tuple[str, str, dict]]:
+    documents = []
+    for experiment_id, payload in created:
+        meta = {**base_meta, "experiment_id": experiment_id, "experiment_title": payload.title}
+        if payload.log_text:
+            documents.append((
+                f"Experiment: {payload.title}\nLog:\n{payload.log_text}",
+                f"experiment-{experiment_id}-log",
+                {**meta, "content_type": "experiment_log"},
+            ))
+        if payload.results_text:
+            documents.append((
+                f"Experiment: {payload.title}\nResults:\n{payload.results_text}",
+                f"experiment-{experiment_id}-results",
+                {**meta, "content_type": "experiment_results"},
+            ))
+    return documents
+
+
+@router.post("/projects/{project_id}/experiments/bulk", response_model=BulkImportResult)
+async def bulk_create_experiments(
+    project_id: int,
+    request: Request,
+    fmt: Optional[Literal["jsonl", "csv"]] = Query(
+        None,
+        alias="format",
+        description="Upload format; defaults to csv for a text/csv Content-Type, jsonl otherwise.",
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Create experiments from a streamed JSONL or CSV upload.
+
+    Each record carries ``title``, ``log_text`` and ``results_text`` (CSV:
+    a header row naming the columns). Records are parsed as the body arrives
+    and inserted in chunks of ``BULK_CHUNK_ROWS``, one batched INSERT and
+    transaction each, so a bad record or chunk doesn't fail the rest of the
+    upload.
+    """
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if fmt is None:
+        fmt = "csv" if "csv" in request.headers.get("content-type", "") else "jsonl"
+
+    base_meta = {"user_id": current_user.id, "project_id": project_id, "project_title": project.title}
+    results: list[BulkRowResult] = []
+    chunk: list[tuple[int, ExperimentCreate]] = []
+    indexing: list[asyncio.Task] = []
+    upload_error = None
+
+    async def flush_chunk():
+        rows, payloads = zip(*chunk)
+        chunk.clear()
+        try:
+            ids = await run_in_threadpool(_insert_chunk, db, project_id, list(payloads))
+        except SQLAlchemyError as exc:
+            logger.error("Bulk insert into project %s failed: %s", project_id, exc)
+            results.extend(
+                BulkRowResult(row=row, status="error", error="Database error; chunk rolled back")
+                for row in rows
+            )
+            return
+        invalidate(f"experiments:{project_id}", "stats")
+        results.extend(
+            BulkRowResult(row=row, status="created", experiment_id=experiment_id)
+            for row, experiment_id in zip(rows, ids)
+        )
+        # Keep at most one embedding batch in flight behind the inserts
+        if indexing:
+            await indexing[-1]
+        indexing.append(
+            asyncio.create_task(upsert_texts(_documents(list(zip(ids, payloads)), base_meta)))
+        )
+
+    try:
+        async for row, fields, error in parse_records(request.stream(), fmt):
+            if error is None:
+                try:
+                    chunk.append((row, ExperimentCreate.model_validate(fields)))
+                except ValidationError as exc:
+                    error = "; ".join(
+                        f"{'.'.join(str(p) for p in e['loc']) or 'row'}: {e['msg']}" for e in exc.errors()
+                    )
+            if error is not None:
+                results.append(BulkRowResult(row=row, status="error", error=error))
+            if len(chunk) >= BULK_CHUNK_ROWS:
+                await flush_chunk()
+    except UploadError as exc:
+        upload_error = str(exc)
+    if chunk:
+        await flush_chunk()
+    indexed = all(await asyncio.gather(*indexing))
+    if indexing:
+        summary_refresher.mark(project_id)
+
+    results.sort(key=lambda r: r.row)
+    created = sum(1 for r in results if r.status == "created")
+    return BulkImportResult(
+        project_id=project_id,
+        total=len(results),
+        created=created,
+        failed=len(results) - created,
+        indexed=indexed,
+        error=upload_error,
+        results=results,
+    )
+
+
 @router.get("/experiments/{experiment_id}", response_model=ExperimentResponse)
 def get_experiment(
     experiment_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
-    if not experiment:
-        raise HTTPException(status_code=404, detail="Experiment not found")
-    return experiment
+    def probe():
+        etag, last_modified = row_validators(db, Experiment, experiment_id)
+        if etag is None:
+            raise HTTPException(status_code=404, detail="Experiment not found")
+        return etag, last_modified
+
+    def load():
+        row = db.query(*_RESPONSE_COLUMNS).filter(Experiment.id == experiment_id).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Experiment not found")
+        return dumps(row_dict(row, ExperimentResponse))
+
+    return cached_json_response(
+        request, db, f"experiment:{experiment_id}", [f"experiment:{experiment_id}"], probe=probe, load=load
+    )
 
 
 @router.put("/experiments/{experiment_id}", response_model=ExperimentResponse)
@@ -110,6 +335,7 @@ async def update_experiment(
 
     db.commit()
     db.refresh(experiment)
+    invalidate(f"experiment:{experiment.id}", f"experiments:{project.id}", "stats")
 
     base_meta = {
         "user_id": project.user_id,
@@ -133,6 +359,9 @@ async def update_experiment(
             metadata={**base_meta, "content_type": "experiment_results"},
         )
 
+    # Summaries list experiment titles and the start of their results
+    if payload.title is not None or payload.results_text is not None:
+        summary_refresher.mark(project.id)
     return experiment
 
 
@@ -155,3 +384,5 @@ async def delete_experiment(
     )
     db.delete(experiment)
     db.commit()
+    invalidate(f"experiment:{experiment_id}", f"experiments:{project.id}", "stats")
+    summary_refresher.mark(project.id)
@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Iterator, Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, or_, select
+from ..database import SessionLocal
+from ..models.experiment import Experiment
+from ..models.project import Project
+from ..models.user import User
+from ..dependencies import get_current_user
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+# Rows fetched per round trip from the server-side cursor, and bytes buffered
+# before a chunk is flushed to the client.
+YIELD_PER = 500
+FLUSH_BYTES = 64 * 1024
+
+PROJECT_FIELDS = {
+    "id": Project.id,
+    "user_id": Project.user_id,
+    "title": Project.title,
+    "description": Project.description,
+    "status": Project.status,
+    "created_at": Project.created_at,
+    "updated_at": Project.updated_at,
+}
+EXPERIMENT_FIELDS = {
+    "id": Experiment.id,
+    "title": Experiment.title,
+    "log_text": Experiment.log_text,
+    "results_text": Experiment.results_text,
+    "created_at": Experiment.created_at,
+    "updated_at": Experiment.updated_at,
+}
+CSV_HEADER = [f"project_{f}" for f in PROJECT_FIELDS] + [f"experiment_{f}" for f in EXPERIMENT_FIELDS]
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):  # enums
+        return value.value
+    return value
+
+
+def _export_rows(updated_since: Optional[datetime]) -> Iterator[tuple]:
+    """Stream (project columns..., experiment columns...) rows, ordered by project.
+
+    Uses its own read-only session (served by a replica when configured): the
+    request-scoped one from get_db is closed before a streaming body is sent.
+    """
+    stmt = (
+        select(
+            *(col.label(f"project_{name}") for name, col in PROJECT_FIELDS.items()),
+            *(col.label(f"experiment_{name}") for name, col in EXPERIMENT_FIELDS.items()),
+        )
+        .outerjoin(Experiment, Experiment.project_id == Project.id)
+        .order_by(Project.id, Experiment.id)
+        .execution_options(yield_per=YIELD_PER)
+    )
+    if updated_since is not None:
+        if updated_since.tzinfo is not None:
+            # Timestamps are stored as naive UTC (server-side now())
+            updated_since = updated_since.astimezone(timezone.utc).replace(tzinfo=None)
+        stmt = stmt.where(
+            or_(
+                func.coalesce(Project.updated_at, Project.created_at) >= updated_since,
+                func.coalesce(Experiment.updated_at, Experiment.created_at) >= updated_since,
+            )
+        )
+
+    db = SessionLocal(info={"read_only": True})
+    try:
+        yield from db.execute(stmt)
+    finally:
+        db.close()
+
+
+def _ndjson(rows: Iterator[tuple]) -> Iterator[str]:
+    """One JSON object per project, with its experiments nested."""
+    n_project = len(PROJECT_FIELDS)
+    buffer = io.StringIO()
+    current = None
+    for row in rows:
+        project_id = row[0]
+        if current is None or current["id"] != project_id:
+            if current is not None:
+                buffer.write(json.dumps(current) + "\n")
+                if buffer.tell() >= FLUSH_BYTES:
+                    yield buffer.getvalue()
+                    buffer = io.StringIO()
+            current = {name: _plain(v) for name, v in zip(PROJECT_FIELDS, row[:n_project])}
+            current["experiments"] = []
+        if row[n_project] is not None:
+            current["experiments"].append(
+                {name: _plain(v) for name, v in zip(EXPERIMENT_FIELDS, row[n_project:])}
+                | {"project_id": project_id}
+            )
+    if current is not None:
+        buffer.write(json.dumps(current) + "\n")
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _csv(rows: Iterator[tuple]) -> Iterator[str]:
+    """One row per experiment; projects without experiments get one row with
+    empty experiment columns."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+    for row in rows:
+        writer.writerow(["" if v is None else _plain(v) for v in row])
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("")
+def export_knowledge_base(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    updated_since: Optional[datetime] = Query(
+        None,
+        description="Only include projects or experiments created/updated at or after this time. "
+        "A changed project is exported with all its experiments; an unchanged project only "
+        "with its changed experiments.",
+    ),
+    _: User = Depends(get_current_user),
+):
+    rows = _export_rows(updated_since)
+    if fmt == "csv":
+        body, media_type = _csv(rows), "text/csv"
+    else:
+        body, media_type = _ndjson(rows), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="research-hub-export.{fmt}"'},
+    )
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from ..database import engine, replicas
+from ..models.user import User
+from ..services.db_metrics_service import pool_snapshot, recent_n_plus_one, recent_slow_queries
+from ..dependencies import get_admin_user
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/db")
+def db_metrics(_: User = Depends(get_admin_user)):
+    """Connection-pool saturation and checkout waits, plus the latest slow
+    queries and likely N+1 patterns seen by this worker."""
+    return {
+        "pool": pool_snapshot(engine),
+        "replica_pools": {host: pool_snapshot(e) for host, e in replicas.engines.items()},
+        "recent_slow_queries": list(recent_slow_queries)[::-1],
+        "recent_n_plus_one": list(recent_n_plus_one)[::-1],
+    }
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from typing import List
+from ..schemas.profile import ProfileInfo
+from ..models.user import User
+from ..services.profiling_service import store
+from ..dependencies import get_admin_user
+
+router = APIRouter(prefix="/profiles", tags=["Profiling"])
+
+
+@router.get("", response_model=List[ProfileInfo])
+def list_profiles(_: User = Depends(get_admin_user)):
+    """Stored request profiles, newest first."""
+    return store.list()
+
+
+@router.get("/{profile_id}")
+def download_profile(profile_id: str, _: User = Depends(get_admin_user)):
+    """Collapsed stacks, one "frame;frame;... count" line each: open in
+    speedscope.app or render with flamegraph.pl."""
+    path = store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=f"profile-{profile_id}.collapsed.txt")
@@ -1,23 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ..database import get_db
 from ..schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
 from ..models.project import Project
 from ..models.user import User, UserRole
 from ..services.pinecone_service import upsert_text, delete_documents
+from ..services.etag_service import (
+    collection_version,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    row_validators,
+    validator_headers,
+)
+from ..services.cache_service import cached_json_response, invalidate
+from ..services.retrieval_service import summary_refresher
+from ..services.serialization_service import dumps, response_columns, row_dict, rows_json
 from ..dependencies import get_current_user
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+_RESPONSE_COLUMNS = response_columns(Project, ProjectResponse)
+
+
+def _list_validators(db: Session, skip: int = 0, limit: Optional[int] = None):
+    """ETag/Last-Modified for the project collection from one aggregate probe."""
+    version, last_modified = collection_version(db, Project)
+    return make_etag("projects", *version, skip, limit), last_modified
+
 
 @router.get("", response_model=List[ProjectResponse])
 def list_projects(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
     # Shared knowledge base — all authenticated users see all projects
-    return db.query(Project).order_by(Project.created_at.desc()).all()
+    def load() -> bytes:
+        query = db.query(*_RESPONSE_COLUMNS).order_by(Project.created_at.desc()).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        return rows_json(query, ProjectResponse)
+
+    # The first page is what the dashboard loads on every visit: serve it from cache
+    if skip == 0:
+        return cached_json_response(
+            request,
+            db,
+            f"projects:list:{limit or 'all'}",
+            ["projects"],
+            probe=lambda: _list_validators(db, skip, limit),
+            load=load,
+        )
+
+    etag, last_modified = _list_validators(db, skip, limit)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    return Response(
+        content=load(), media_type="application/json", headers=validator_headers(etag, last_modified)
+    )
 
 
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
@@ -35,6 +79,7 @@ async def create_project(
     db.add(project)
     db.commit()
     db.refresh(project)
+    invalidate("projects")
 
     await upsert_text(
         text=f"Project Title: {project.title}\n\nDescription:\n{project.description}",
@@ -46,19 +91,32 @@ async def create_project(
             "content_type": "project_description",
         },
     )
+    summary_refresher.mark(project.id)
     return project
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 def get_project(
     project_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    def probe():
+        etag, last_modified = row_validators(db, Project, project_id)
+        if etag is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return etag, last_modified
+
+    def load():
+        row = db.query(*_RESPONSE_COLUMNS).filter(Project.id == project_id).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return dumps(row_dict(row, ProjectResponse))
+
+    return cached_json_response(
+        request, db, f"project:{project_id}", [f"project:{project_id}"], probe=probe, load=load
+    )
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
@@ -80,6 +138,7 @@ async def update_project(
 
     db.commit()
     db.refresh(project)
+    invalidate("projects", f"project:{project.id}")
 
     # Re-embed whenever title or description changes
     if payload.title is not None or payload.description is not None:
@@ -93,6 +152,7 @@ async def update_project(
                 "content_type": "project_description",
             },
         )
+        summary_refresher.mark(project.id)
     return project
 
 
@@ -109,14 +169,18 @@ async def delete_project(
     if project.user_id != current_user.id and current_user.role != UserRole.admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    # Collect all Pinecone doc IDs for this project
+    # Collect all Pinecone doc IDs and cache tags for this project
     pinecone_ids = [f"project-{project.id}-description"]
+    cache_tags = ["projects", f"project:{project.id}", f"experiments:{project.id}"]
     for exp in project.experiments:
         pinecone_ids += [
             f"experiment-{exp.id}-log",
             f"experiment-{exp.id}-results",
         ]
+        cache_tags.append(f"experiment:{exp.id}")
 
     await delete_documents(pinecone_ids)
     db.delete(project)
     db.commit()
+    invalidate(*cache_tags)
+    summary_refresher.mark(project_id)
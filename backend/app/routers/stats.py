@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..schemas.stats import ActivityItem, DashboardStats
+from ..models.experiment import Experiment
+from ..models.project import Project, ProjectStatus
+from ..models.user import User
+from ..services.etag_service import collection_version, make_etag
+from ..services.cache_service import cached_json_response
+from ..dependencies import get_current_user
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+RECENT_ACTIVITY_LIMIT = 10
+
+
+def _validators(db: Session):
+    """ETag/Last-Modified over both tables from two aggregate probes."""
+    projects, projects_changed = collection_version(db, Project)
+    experiments, experiments_changed = collection_version(db, Experiment)
+    changed = [t for t in (projects_changed, experiments_changed) if t is not None]
+    return make_etag("stats", *projects, *experiments), max(changed) if changed else None
+
+
+def _recent_activity(db: Session) -> list[ActivityItem]:
+    project_ts = func.coalesce(Project.updated_at, Project.created_at)
+    experiment_ts = func.coalesce(Experiment.updated_at, Experiment.created_at)
+
+    items = [
+        ActivityItem(
+            kind="project",
+            action="updated" if updated_at else "created",
+            id=pid,
+            title=title,
+            project_id=pid,
+            project_title=title,
+            timestamp=updated_at or created_at,
+        )
+        for pid, title, created_at, updated_at in db.query(
+            Project.id, Project.title, Project.created_at, Project.updated_at
+        )
+        .order_by(project_ts.desc())
+        .limit(RECENT_ACTIVITY_LIMIT)
+    ]
+    items += [
+        ActivityItem(
+            kind="experiment",
+            action="updated" if updated_at else "created",
+            id=eid,
+            title=title,
+            project_id=pid,
+            project_title=project_title,
+            timestamp=updated_at or created_at,
+        )
+        for eid, title, pid, project_title, created_at, updated_at in db.query(
+            Experiment.id,
+            Experiment.title,
+            Experiment.project_id,
+            Project.title,
+            Experiment.created_at,
+            Experiment.updated_at,
+        )
+        .join(Project, Project.id == Experiment.project_id)
+        .order_by(experiment_ts.desc())
+        .limit(RECENT_ACTIVITY_LIMIT)
+    ]
+    items.sort(key=lambda item: item.timestamp, reverse=True)
+    return items[:RECENT_ACTIVITY_LIMIT]
+
+
+def _load(db: Session) -> bytes:
+    by_status = {s.value: 0 for s in ProjectStatus}
+    for project_status, count in db.query(Project.status, func.count(Project.id)).group_by(Project.status):
+        by_status[project_status.value] = count
+
+    per_project = dict(
+        db.query(Experiment.project_id, func.count(Experiment.id)).group_by(Experiment.project_id)
+    )
+
+    return DashboardStats(
+        total_projects=sum(by_status.values()),
+        projects_by_status=by_status,
+        total_experiments=sum(per_project.values()),
+        experiments_per_project=per_project,
+        recent_activity=_recent_activity(db),
+    ).model_dump_json().encode()
+
+
+@router.get("", response_model=DashboardStats)
+def get_stats(
+    request: Request,
+    db: Session = Depends(get_db),
+    _: User = Depends(get_current_user),
+):
+    # Aggregates over the shared knowledge base; one entry serves every user
+    return cached_json_response(
+        request,
+        db,
+        "stats",
+        ["projects", "stats"],
+        probe=lambda: _validators(db),
+        load=lambda: _load(db),
+    )
@@ -4,6 +4,10 @@ from typing import List
 from ..database import get_db
 from ..schemas.user import UserResponse, UserUpdate
 from ..models.user import User
+from ..models.project import Project
+from ..models.experiment import Experiment
+from ..services.cache_service import invalidate
+from ..services.retrieval_service import summary_refresher
 from ..dependencies import get_current_user, get_admin_user
 
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -69,5 +73,21 @@ def delete_user(
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    # Deleting a user cascades to their projects and those projects' experiments
+    cache_tags = ["projects"]
+    project_ids = set()
+    for project_id, experiment_id in (
+        db.query(Project.id, Experiment.id)
+        .outerjoin(Experiment, Experiment.project_id == Project.id)
+        .filter(Project.user_id == user_id)
+    ):
+        project_ids.add(project_id)
+        cache_tags += [f"project:{project_id}", f"experiments:{project_id}"]
+        if experiment_id is not None:
+            cache_tags.append(f"experiment:{experiment_id}")
     db.delete(user)
     db.commit()
+    invalidate(*dict.fromkeys(cache_tags))
+    # The projects are gone, so refreshing them deletes their summary vectors
+    for project_id in project_ids:
+        summary_refresher.mark(project_id)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 
 class ExperimentBase(BaseModel):
@@ -26,3 +26,20 @@ class ExperimentResponse(ExperimentBase):
     updated_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
+
+
+class BulkRowResult(BaseModel):
+    row: int
+    status: Literal["created", "error"]
+    experiment_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkImportResult(BaseModel):
+    project_id: int
+    total: int
+    created: int
+    failed: int
+    indexed: bool
+    error: Optional[str] = None
+    results: List[BulkRowResult]
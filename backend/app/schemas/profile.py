@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+
+class ProfileInfo(BaseModel):
+    id: str
+    reason: Literal["requested", "sampled", "slow"]
+    method: str
+    path: str
+    status: Optional[int] = None
+    duration_ms: float
+    profiled_from_ms: float
+    samples: int
+    interval_ms: float
+    captured_at: str
+    pid: int
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
+
+
+class ActivityItem(BaseModel):
+    kind: Literal["project", "experiment"]
+    action: Literal["created", "updated"]
+    id: int
+    title: str
+    project_id: int
+    project_title: Optional[str] = None
+    timestamp: datetime
+
+
+class DashboardStats(BaseModel):
+    total_projects: int
+    projects_by_status: Dict[str, int]
+    total_experiments: int
+    experiments_per_project: Dict[int, int]
+    recent_activity: List[ActivityItem]
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+    def __init__(self, breaker: "CircuitBreaker"):
+        super().__init__(f"{breaker.name} is unavailable (circuit open)")
+        self.breaker = breaker
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker for one external dependency.
+
+    Calls from the last ``window`` seconds are kept; a call counts as failed
+    if it raised or took longer than ``slow_ms``. Once at least ``min_calls``
+    are in the window and the failed share reaches ``failure_rate`` the
+    breaker opens and ``allow()`` refuses calls for ``open_seconds``. After
+    that one probe call at a time is let through (half-open): a success
+    closes the breaker, a failure re-opens it.
+    """
+
+    def __init__(
+        self, name: str, slow_ms: float, *, failure_rate: float, min_calls: int,
+        window: float, open_seconds: float,
+    ):
+        self.name = name
+        self.slow_ms = slow_ms
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.state = "closed"
+        self.opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self._calls: deque = deque()  # (finished_at, failed)
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._calls and self._calls[0][0] < now - self.window:
+            self._calls.popleft()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            now = time.monotonic()
+            if self.state == "open":
+                if now - self.opened_at < self.open_seconds:
+                    return False
+                self.state = "half_open"
+                self._probe_started = None
+            # Half-open: one probe at a time; a probe abandoned without a
+            # result (e.g. its request was cancelled) stops blocking after a while
+            if self._probe_started is not None and now - self._probe_started < self.open_seconds:
+                return False
+            self._probe_started = now
+            return True
+
+    def record(self, ok: bool, elapsed_ms: float = 0.0) -> None:
+        failed = not ok or elapsed_ms > self.slow_ms
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "half_open":
+                if failed:
+                    self._open(now, "probe failed")
+                else:
+                    logger.info("Circuit %s closed", self.name)
+                    self.state, self.opened_at, self._probe_started = "closed", None, None
+                    self._calls.clear()
+                return
+            if self.state == "open":
+                return  # a call that started before the breaker opened
+            self._calls.append((now, failed))
+            self._prune(now)
+            failures = sum(1 for _, f in self._calls if f)
+            if len(self._calls) >= self.min_calls and failures / len(self._calls) >= self.failure_rate:
+                self._open(now, f"{failures}/{len(self._calls)} calls failed or slow")
+
+    def call(self, fn, /, *args, **kwargs):
+        """Call blocking ``fn`` in this thread behind the breaker."""
+        if not self.allow():
+            raise CircuitOpenError(self)
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record(False)
+            raise
+        self.record(True, (time.perf_counter() - started) * 1000)
+        return result
+
+    def _open(self, now: float, reason: str) -> None:
+        logger.warning("Circuit %s open for %.0fs: %s", self.name, self.open_seconds, reason)
+        self.state, self.opened_at, self._probe_started = "open", now, None
+        self._calls.clear()
+
+    def status(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            body = {
+                "state": self.state,
+                "calls": len(self._calls),
+                "failed": sum(1 for _, f in self._calls if f),
+            }
+            if self.state == "open":
+                body["retry_in_s"] = round(max(self.opened_at + self.open_seconds - now, 0), 1)
+            return body
+
+
+async def guarded_call(breaker: CircuitBreaker, fn, /, *args, timeout: Optional[float] = None, **kwargs):
+    """Run blocking ``fn`` in the threadpool behind ``breaker``, failing fast
+    with ``CircuitOpenError`` while it is open.
+
+    ``timeout`` frees the caller, not the worker thread; it is the breaker
+    opening that stops further threads from piling up on a dead dependency.
+    """
+    if not breaker.allow():
+        raise CircuitOpenError(breaker)
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(run_in_threadpool(fn, *args, **kwargs), timeout)
+    except asyncio.TimeoutError:
+        breaker.record(False)
+        raise TimeoutError(f"{breaker.name} call timed out after {timeout:g}s") from None
+    except Exception:
+        breaker.record(False)
+        raise
+    breaker.record(True, (time.perf_counter() - started) * 1000)
+    return result
+
+
+def _breaker(name: str, slow_ms: float) -> CircuitBreaker:
+    return CircuitBreaker(
+        name, slow_ms,
+        failure_rate=settings.BREAKER_FAILURE_RATE,
+        min_calls=settings.BREAKER_MIN_CALLS,
+        window=settings.BREAKER_WINDOW_SECONDS,
+        open_seconds=settings.BREAKER_OPEN_SECONDS,
+    )
+
+
+pinecone_breaker = _breaker("pinecone", settings.PINECONE_SLOW_CALL_MS)
+groq_breaker = _breaker("groq", settings.GROQ_SLOW_FIRST_TOKEN_MS)
+redis_breaker = _breaker("redis", settings.REDIS_SLOW_CALL_MS)
+breakers = [pinecone_breaker, groq_breaker, redis_breaker]
+
+
+def breaker_status() -> dict:
+    return {b.name: b.status() for b in breakers}
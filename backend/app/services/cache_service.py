@@ -0,0 +1,298 @@
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, Optional
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import use_primary
+from .breaker_service import CircuitOpenError, redis_breaker
+from .etag_service import is_not_modified, not_modified, validator_headers, http_date
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "rh:cache"
+LOCK_TTL_SECONDS = 5.0      # upper bound on one loader run holding the stampede lock
+LOCK_POLL_SECONDS = 0.02
+
+
+class LocalBackend:
+    """Process-local LRU with per-entry TTL, used when Redis isn't configured.
+
+    Tag versions live outside the LRU so evicting them can never make an old
+    generation of entries reachable again. Invalidations only reach this
+    process, so it is only used with a single worker, and with a short TTL
+    in case more workers run than ``WEB_CONCURRENCY`` says.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._tags: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[0] >= time.monotonic():
+                return False
+            self._entries[key] = (time.monotonic() + ttl, value)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_tags(self, keys: list[str]) -> list[Optional[bytes]]:
+        with self._lock:
+            return [self._tags.get(k) for k in keys]
+
+    def init_tag(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._tags.setdefault(key, value)
+
+    def set_tags(self, keys: list[str], value: bytes) -> None:
+        with self._lock:
+            for key in keys:
+                self._tags[key] = value
+
+
+class RedisBackend:
+    """Shared cache in the Redis instance already deployed for chat history.
+    Calls go through the Redis circuit breaker, so while Redis is down reads
+    fall straight through to the database."""
+
+    def __init__(self, url: str):
+        import redis
+
+        # Short timeouts: a slow cache must never be slower than the database
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return redis_breaker.call(self.client.get, key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        redis_breaker.call(self.client.set, key, value, px=int(ttl * 1000))
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(redis_breaker.call(self.client.set, key, value, px=int(ttl * 1000), nx=True))
+
+    def delete(self, key: str) -> None:
+        redis_breaker.call(self.client.delete, key)
+
+    def get_tags(self, keys: list[str]) -> list[Optional[bytes]]:
+        return redis_breaker.call(self.client.mget, keys)
+
+    def init_tag(self, key: str, value: bytes) -> None:
+        redis_breaker.call(self.client.set, key, value, nx=True)
+
+    def set_tags(self, keys: list[str], value: bytes) -> None:
+        redis_breaker.call(self.client.mset, {key: value for key in keys})
+
+
+class ReadThroughCache:
+    """Tag-invalidated read-through cache of serialized response bytes.
+
+    Each tag has a version token and an entry's key embeds the versions of
+    its tags, so ``invalidate(tag)`` just writes a fresh token: every entry
+    carrying the tag becomes unreachable at once and ages out by TTL. A write
+    that races a load can at worst store data under a key nobody will look up
+    again.
+    """
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    def _key(self, name: str, tags: Iterable[str]) -> str:
+        tag_keys = [f"{PREFIX}:tag:{t}" for t in tags]
+        versions = self.backend.get_tags(tag_keys) if tag_keys else []
+        for i, version in enumerate(versions):
+            if version is None:
+                # Never reuse a version (e.g. after Redis evicted the tag key)
+                self.backend.init_tag(tag_keys[i], uuid.uuid4().hex[:12].encode())
+                versions[i] = self.backend.get_tags([tag_keys[i]])[0]
+        suffix = ".".join(v.decode() if isinstance(v, bytes) else str(v) for v in versions)
+        return f"{PREFIX}:{name}:{suffix}"
+
+    def get(self, name: str, tags: Iterable[str]) -> tuple[str, Optional[bytes]]:
+        key = self._key(name, tags)
+        return key, self.backend.get(key)
+
+    def load(self, key: str, loader: Callable[[], bytes], ttl: Optional[float] = None) -> bytes:
+        """Run ``loader`` once per key across concurrent callers and store the result.
+
+        The first caller takes a short lock and loads; the others poll for its
+        result. If the holder fails, one of them takes the lock over as soon
+        as it is released; they only load without it once the lock TTL has
+        passed.
+        """
+        lock_key = f"{key}:lock"
+        deadline = time.monotonic() + LOCK_TTL_SECONDS
+        while True:
+            if self.backend.add(lock_key, b"1", LOCK_TTL_SECONDS):
+                try:
+                    value = loader()
+                    # Jitter so entries filled together don't all expire together
+                    self.backend.set(key, value, (ttl or self.ttl) * random.uniform(0.9, 1.1))
+                    return value
+                finally:
+                    self.backend.delete(lock_key)
+
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL_SECONDS)
+                value = self.backend.get(key)
+                if value is not None:
+                    return value
+                if self.backend.get(lock_key) is None:
+                    # The holder let go without storing a value (its loader
+                    # raised): take over rather than wait out the lock TTL
+                    value = self.backend.get(key)
+                    if value is not None:
+                        return value
+                    break
+            else:
+                return loader()
+
+    def invalidate(self, *tags: str) -> None:
+        if not tags:
+            return
+        token = uuid.uuid4().hex[:12].encode()
+        self.backend.set_tags([f"{PREFIX}:tag:{t}" for t in tags], token)
+
+
+def _create_cache() -> Optional[ReadThroughCache]:
+    if settings.redis_configured:
+        logger.info("Read cache using Redis at %s", settings.REDIS_HOST)
+        return ReadThroughCache(RedisBackend(settings.redis_url), settings.CACHE_TTL_SECONDS)
+    if settings.WEB_CONCURRENCY > 1:
+        # Each worker would keep serving entries another worker invalidated
+        logger.warning(
+            "Read cache disabled: Redis is not configured and WEB_CONCURRENCY=%d workers "
+            "cannot share a process-local cache", settings.WEB_CONCURRENCY,
+        )
+        return None
+    logger.info("Read cache using a process-local LRU (Redis not configured, single worker)")
+    return ReadThroughCache(LocalBackend(settings.CACHE_LOCAL_MAX_ENTRIES), settings.CACHE_LOCAL_TTL_SECONDS)
+
+
+cache = _create_cache()
+
+
+def _pack(body: bytes, etag: str, last_modified: Optional[datetime]) -> bytes:
+    meta = {"etag": etag, "last_modified": http_date(last_modified) if last_modified else None}
+    return json.dumps(meta).encode() + b"\n" + body
+
+
+def _unpack(value: bytes) -> tuple[bytes, dict]:
+    meta, _, body = value.partition(b"\n")
+    return body, json.loads(meta)
+
+
+def _headers(meta: dict) -> dict:
+    headers = validator_headers(meta["etag"])
+    if meta["last_modified"]:
+        headers["Last-Modified"] = meta["last_modified"]
+    return headers
+
+
+def cached_json_response(
+    request: Request,
+    db: Session,
+    name: str,
+    tags: list[str],
+    probe: Callable[[], tuple[str, Optional[datetime]]],
+    load: Callable[[], bytes],
+) -> Response:
+    """Serve a JSON read from the cache, falling back to the database.
+
+    ``probe`` returns the resource's (ETag, Last-Modified) cheaply and raises
+    for a missing resource; ``load`` returns the serialized body. On a hit,
+    a matching If-None-Match is answered without touching the database; on a
+    miss the probe still short-circuits to 304 before anything is hydrated.
+    Misses read ``db`` from the primary: an entry filled from a lagging
+    replica would outlive the replica's lag, and every client (including
+    one pinned to the primary after a write) would be served it until the
+    TTL. Cache errors never fail the request.
+    """
+    if cache is None or not settings.CACHE_ENABLED:
+        return _uncached(request, probe, load)
+    try:
+        key, value = cache.get(name, tags)
+    except Exception as exc:
+        logger.warning("Cache read failed for %s: %s", name, exc)
+        return _uncached(request, probe, load)
+
+    if value is None:
+        use_primary(db)
+        etag, last_modified = probe()
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        try:
+            value = cache.load(key, lambda: _pack(load(), etag, last_modified))
+        except Exception as exc:
+            if not _is_backend_error(exc):
+                raise
+            logger.warning("Cache fill failed for %s: %s", name, exc)
+            return _uncached(request, probe, load)
+
+    body, meta = _unpack(value)
+    if request.headers.get("if-none-match") is not None or request.headers.get("if-modified-since"):
+        last_modified = parsedate_to_datetime(meta["last_modified"]) if meta["last_modified"] else None
+        if is_not_modified(request, meta["etag"], last_modified):
+            return Response(status_code=304, headers=_headers(meta))
+    return Response(content=body, media_type="application/json", headers=_headers(meta))
+
+
+def _uncached(request: Request, probe, load) -> Response:
+    etag, last_modified = probe()
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    return Response(
+        content=load(), media_type="application/json", headers=validator_headers(etag, last_modified)
+    )
+
+
+def _is_backend_error(exc: Exception) -> bool:
+    if isinstance(exc, CircuitOpenError):
+        return True
+    try:
+        import redis
+    except ImportError:
+        return False
+    return isinstance(exc, redis.RedisError)
+
+
+def invalidate(*tags: str) -> None:
+    """Invalidate cached reads by tag after a committed write; never raises."""
+    if cache is None:
+        return
+    try:
+        cache.invalidate(*tags)
+    except Exception as exc:
+        logger.warning("Cache invalidation failed for %s: %s", tags, exc)
@@ -1,24 +1,38 @@
+import asyncio
 import logging
-from typing import AsyncGenerator
+import threading
+from collections import OrderedDict
+from typing import AsyncGenerator, Optional, Union
 from langchain_groq import ChatGroq
 from langchain_community.chat_message_histories import RedisChatMessageHistory
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import StrOutputParser
-from .pinecone_service import get_retriever
+from langchain_core.runnables import Runnable
+from .breaker_service import CircuitOpenError, groq_breaker, guarded_call, redis_breaker
+from .retrieval_service import retrieve
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Short socket timeouts so a hung Redis fails a call rather than a thread
 REDIS_URL = (
-    f"redis://:{settings.REDIS_PASSWORD}@{settings.REDIS_HOST}:{settings.REDIS_PORT}/0"
-    if settings.REDIS_PASSWORD
-    else f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/0"
+    f"{settings.redis_url}?socket_timeout={settings.REDIS_TIMEOUT_SECONDS}"
+    f"&socket_connect_timeout={settings.REDIS_TIMEOUT_SECONDS}"
 )
 
-llm = ChatGroq(
-    api_key=settings.GROQ_API_KEY,
-    model=settings.GROQ_MODEL,
-    streaming=True,
+
+def _groq(model: str) -> ChatGroq:
+    return ChatGroq(api_key=settings.GROQ_API_KEY, model=model, streaming=True)
+
+
+# Backends in order of preference; see hedged_stream
+answer_llms = [_groq(model) for model in [settings.GROQ_MODEL, *settings.GROQ_FALLBACK_MODELS]]
+contextualize_llms = (
+    [_groq(settings.GROQ_CONTEXTUALIZE_MODEL), *answer_llms]
+    if settings.GROQ_CONTEXTUALIZE_MODEL and settings.GROQ_CONTEXTUALIZE_MODEL != settings.GROQ_MODEL
+    else answer_llms
 )
 
 CONTEXTUALIZE_PROMPT = """Given a chat history and the latest user question which \
@@ -37,20 +51,230 @@ Always cite the project or experiment name when referencing information.
 Retrieved context:
 {context}"""
 
+RETRIEVAL_UNAVAILABLE = """The team's knowledge base could not be searched \
+for this question. Say so, and answer only from the conversation or general \
+knowledge without citing projects or experiments."""
+
+
+class DegradedNotice:
+    """Yielded ahead of the answer when it is produced without some of its
+    inputs (``"history"``, ``"retrieval"``) because a dependency is down."""
+
+    def __init__(self, missing: list[str]):
+        self.missing = missing
+
+
+class HistoryBuffer:
+    """Chat turns that could not be written to Redis, per session, until
+    they can be flushed. Reads merge them in, so a conversation keeps its
+    context on this worker through an outage. Least recently used sessions
+    are dropped beyond ``max_sessions``."""
+
+    def __init__(self, max_sessions: int):
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, list[BaseMessage]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def get(self, session_id: str) -> list[BaseMessage]:
+        with self._lock:
+            return list(self._sessions.get(session_id, ()))
+
+    def add(self, session_id: str, messages: list[BaseMessage]) -> None:
+        with self._lock:
+            self._sessions.setdefault(session_id, []).extend(messages)
+            self._sessions.move_to_end(session_id)
+            if len(self._sessions) > self.max_sessions:
+                dropped, _ = self._sessions.popitem(last=False)
+                logger.error("Chat history buffer full; dropped buffered turns of session %s", dropped)
+
+    def take(self) -> Optional[tuple[str, list[BaseMessage]]]:
+        with self._lock:
+            return self._sessions.popitem(last=False) if self._sessions else None
+
+    def restore(self, session_id: str, messages: list[BaseMessage]) -> None:
+        with self._lock:
+            self._sessions[session_id] = messages + self._sessions.get(session_id, [])
+            self._sessions.move_to_end(session_id, last=False)
+
+
+history_buffer = HistoryBuffer(settings.CHAT_HISTORY_BUFFER_MAX_SESSIONS)
+
 
 def _get_history(session_id: str) -> RedisChatMessageHistory:
     return RedisChatMessageHistory(session_id=session_id, url=REDIS_URL)
 
 
+async def _load_history(history, session_id: str) -> Optional[list[BaseMessage]]:
+    """Stored plus locally buffered messages, or None if Redis is unavailable
+    (the buffered ones are then all there is)."""
+    try:
+        stored = await guarded_call(redis_breaker, lambda: history.messages)
+    except Exception as exc:
+        if not isinstance(exc, CircuitOpenError):
+            logger.warning("Could not load chat history for %s: %s", session_id, exc)
+        return None
+    return stored + history_buffer.get(session_id)
+
+
+async def _save_history(history, session_id: str, messages: list[BaseMessage]) -> None:
+    # Turns already buffered for the session must reach Redis first
+    if session_id not in history_buffer:
+        try:
+            await guarded_call(redis_breaker, history.add_messages, messages)
+            return
+        except Exception as exc:
+            if not isinstance(exc, CircuitOpenError):
+                logger.warning("Could not save chat history for %s, buffering: %s", session_id, exc)
+    history_buffer.add(session_id, messages)
+
+
+async def flush_history_buffer() -> int:
+    """Write buffered turns to Redis while it accepts them; returns sessions flushed."""
+    flushed = 0
+    while (item := history_buffer.take()) is not None:
+        session_id, messages = item
+        try:
+            await guarded_call(redis_breaker, _get_history(session_id).add_messages, messages)
+        except Exception as exc:
+            history_buffer.restore(session_id, messages)
+            if not isinstance(exc, CircuitOpenError):
+                logger.warning("Flushing buffered chat history failed: %s", exc)
+            break
+        flushed += 1
+    if flushed:
+        logger.info("Flushed buffered chat history of %d sessions, %d left", flushed, len(history_buffer))
+    return flushed
+
+
+def build_context(docs: list[Document]) -> str:
+    """Render retrieved documents into the labelled context block for the QA prompt."""
+    context_blocks = []
+    for doc in docs:
+        meta = doc.metadata
+        label = (
+            f"[{meta.get('content_type', 'content')} | "
+            f"Project: {meta.get('project_title', 'Unknown')}]"
+        )
+        context_blocks.append(f"{label}\n{doc.page_content}")
+    return "\n\n---\n\n".join(context_blocks) if context_blocks else "No relevant context found."
+
+
+def _backend_name(llm) -> str:
+    return getattr(llm, "model_name", None) or type(llm).__name__
+
+
+_END = object()
+
+
+async def _pump(chain: Runnable, inputs: dict, queue: asyncio.Queue, attempt: int) -> None:
+    """Forward one attempt's chunks to ``queue`` as ``(attempt, chunk, error)``."""
+    try:
+        async for chunk in chain.astream(inputs):
+            await queue.put((attempt, chunk, None))
+    except Exception as exc:
+        await queue.put((attempt, None, exc))
+    else:
+        await queue.put((attempt, _END, None))
+
+
+async def hedged_stream(
+    prompt: ChatPromptTemplate, llms: list, inputs: dict
+) -> AsyncGenerator[str, None]:
+    """Stream ``prompt | llm`` from the first backend in ``llms`` to produce
+    a token.
+
+    The next backend is started alongside the ones in flight whenever
+    ``LLM_FIRST_TOKEN_DEADLINE_SECONDS`` pass without a first token, or as
+    soon as every attempt in flight has failed. Once an attempt streams its
+    first token the others are cancelled, so time to first token is bounded
+    by the deadline rather than by the slowest upstream. Failures after the
+    first token are raised: the user has already seen part of that answer.
+    """
+    if not groq_breaker.allow():
+        raise CircuitOpenError(groq_breaker)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = settings.LLM_FIRST_TOKEN_DEADLINE_SECONDS
+    queue: asyncio.Queue = asyncio.Queue()
+    tasks: list[asyncio.Task] = []
+    failed = 0
+    hedge_at: Optional[float] = None
+
+    def launch() -> None:
+        nonlocal hedge_at
+        chain = prompt | llms[len(tasks)] | StrOutputParser()
+        tasks.append(asyncio.create_task(_pump(chain, inputs, queue, len(tasks))))
+        hedge_at = loop.time() + deadline if deadline > 0 and len(tasks) < len(llms) else None
+
+    launch()
+    try:
+        # Race until some attempt produces a (non-empty) token or finishes
+        while True:
+            timeout = None if hedge_at is None else max(hedge_at - loop.time(), 0)
+            try:
+                attempt, chunk, error = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "No first token from %s after %.1fs; hedging with %s",
+                    _backend_name(llms[len(tasks) - 1]), deadline, _backend_name(llms[len(tasks)]),
+                )
+                launch()
+                continue
+            if error is not None:
+                failed += 1
+                logger.warning("LLM backend %s failed: %s", _backend_name(llms[attempt]), error)
+                if failed < len(tasks):
+                    continue
+                if len(tasks) == len(llms):
+                    groq_breaker.record(False)
+                    raise error
+                launch()
+                continue
+            if chunk == "":
+                continue
+            winner = attempt
+            groq_breaker.record(True, (loop.time() - started) * 1000)
+            break
+
+        for i, task in enumerate(tasks):
+            if i != winner:
+                task.cancel()
+        if winner:
+            logger.info("Answered by fallback backend %s", _backend_name(llms[winner]))
+
+        while chunk is not _END:
+            yield chunk
+            attempt, chunk, error = await queue.get()
+            while attempt != winner:  # stragglers queued before the cancel
+                attempt, chunk, error = await queue.get()
+            if error is not None:
+                raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 async def stream_chat_response(
     message: str, session_id: str
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[Union[str, DegradedNotice], None]:
+    """Stream the answer to ``message``. If chat history or retrieval is
+    unavailable the answer is produced without it, preceded by a
+    ``DegradedNotice``; only an LLM outage fails the stream."""
     history = _get_history(session_id)
-    past_messages = history.messages
+    missing = []
+    past_messages = await _load_history(history, session_id)
+    if past_messages is None:
+        missing.append("history")
+        past_messages = history_buffer.get(session_id)
 
-    retriever = get_retriever(k=6)
-
-    # Step 1 — Contextualise query using chat history (non-streaming)
+    # Step 1 — Contextualise query using chat history (hedged stream, joined before retrieval)
+    standalone_query = message
     if past_messages:
         ctx_prompt = ChatPromptTemplate.from_messages(
             [
@@ -59,24 +283,28 @@ async def stream_chat_response(
                 ("human", "{input}"),
             ]
         )
-        ctx_chain = ctx_prompt | llm | StrOutputParser()
-        standalone_query = await ctx_chain.ainvoke(
-            {"input": message, "chat_history": past_messages}
-        )
-    else:
-        standalone_query = message
+        try:
+            standalone_query = "".join([
+                chunk async for chunk in hedged_stream(
+                    ctx_prompt, contextualize_llms, {"input": message, "chat_history": past_messages}
+                )
+            ])
+        except Exception as exc:
+            # The raw follow-up still retrieves something; the answer step
+            # reports the outage if the LLM is down altogether
+            logger.warning("Could not contextualise query, using it as-is: %s", exc)
 
     # Step 2 — Retrieve relevant documents
-    docs = await retriever.ainvoke(standalone_query)
-    context_blocks = []
-    for doc in docs:
-        meta = doc.metadata
-        label = (
-            f"[{meta.get('content_type', 'content')} | "
-            f"Project: {meta.get('project_title', 'Unknown')}]"
-        )
-        context_blocks.append(f"{label}\n{doc.page_content}")
-    context = "\n\n---\n\n".join(context_blocks) if context_blocks else "No relevant context found."
+    try:
+        context = build_context(await retrieve(standalone_query, k=6))
+    except Exception as exc:
+        if not isinstance(exc, CircuitOpenError):
+            logger.warning("Retrieval failed, answering without context: %s", exc)
+        missing.append("retrieval")
+        context = RETRIEVAL_UNAVAILABLE
+
+    if missing:
+        yield DegradedNotice(missing)
 
     # Step 3 — Stream the answer
     qa_prompt = ChatPromptTemplate.from_messages(
@@ -86,15 +314,12 @@ async def stream_chat_response(
             ("human", "{input}"),
         ]
     )
-    chain = qa_prompt | llm | StrOutputParser()
-
     full_response = ""
-    async for chunk in chain.astream(
-        {"context": context, "input": message, "chat_history": past_messages}
+    async for chunk in hedged_stream(
+        qa_prompt, answer_llms, {"context": context, "input": message, "chat_history": past_messages}
     ):
         full_response += chunk
         yield chunk
 
-    # Persist to Redis after streaming completes
-    history.add_user_message(message)
-    history.add_ai_message(full_response)
+    # Persist after streaming completes (buffered locally if Redis is down)
+    await _save_history(history, session_id, [HumanMessage(content=message), AIMessage(content=full_response)])
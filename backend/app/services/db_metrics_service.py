@@ -0,0 +1,252 @@
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from starlette.datastructures import MutableHeaders
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+SLOWEST_KEPT = 3
+RECENT_KEPT = 50
+WAIT_SAMPLES_KEPT = 2000
+
+
+class QueryStats:
+    """Queries issued while serving one request.
+
+    Sync handlers and dependencies run in threadpool threads with a copy of
+    the request's context, which still refers to this same object, so every
+    query of the request lands here.
+    """
+
+    def __init__(self, method: str = "", path: str = ""):
+        self.method = method
+        self.path = path
+        self.count = 0
+        self.total_ms = 0.0
+        self.pool_wait_ms = 0.0
+        self.statements: Counter[str] = Counter()
+        self.slowest: list[tuple[float, str]] = []
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.statements[statement] += 1
+        if len(self.slowest) < SLOWEST_KEPT or elapsed_ms > self.slowest[-1][0]:
+            self.slowest = sorted(self.slowest + [(elapsed_ms, statement)], reverse=True)[:SLOWEST_KEPT]
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Identical statements run at least ``threshold`` times: likely N+1."""
+        return [(s, n) for s, n in self.statements.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.total_ms:.1f};desc="{self.count} queries", '
+            f"db-pool;dur={self.pool_wait_ms:.1f}"
+        )
+
+
+current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Recent findings, for the admin metrics endpoint
+recent_slow_queries: deque = deque(maxlen=RECENT_KEPT)
+recent_n_plus_one: deque = deque(maxlen=RECENT_KEPT)
+
+
+def _shape(value) -> str:
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shapes(parameters) -> str:
+    """Describe bound parameters by type and size, never by value: rows hold
+    clinical notes that must not end up in logs."""
+    if isinstance(parameters, list):  # executemany
+        return f"{len(parameters)} x {parameter_shapes(parameters[0])}" if parameters else "[]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {_shape(v)}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (tuple, list)):
+        return "(" + ", ".join(_shape(v) for v in parameters) + ")"
+    return _shape(parameters)
+
+
+def _one_line(statement: str) -> str:
+    return " ".join(statement.split())
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement on ``engine`` into the current request's stats
+    and log the ones slower than ``DB_SLOW_QUERY_MS``."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+        stats = current_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed_ms)
+        if elapsed_ms >= settings.DB_SLOW_QUERY_MS:
+            shapes = parameter_shapes(parameters)
+            logger.warning(
+                "Slow query (%.1f ms) during %s %s: %s | params: %s",
+                elapsed_ms, stats.method if stats else "-", stats.path if stats else "-",
+                _one_line(statement), shapes,
+            )
+            recent_slow_queries.append({
+                "duration_ms": round(elapsed_ms, 1),
+                "statement": _one_line(statement),
+                "params": shapes,
+                "request": f"{stats.method} {stats.path}" if stats else None,
+                "at": time.time(),
+            })
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # The after hook never runs for a failed statement
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+class PoolMetrics:
+    """Checkout wait times and exhaustion for one connection pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self._waits: deque = deque(maxlen=WAIT_SAMPLES_KEPT)
+        self._lock = threading.Lock()
+
+    def record(self, waited_ms: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.total_wait_ms += waited_ms
+                self._waits.append(waited_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            checkouts, timeouts, total = self.checkouts, self.timeouts, self.total_wait_ms
+
+        def pct(p):
+            return round(waits[min(len(waits) - 1, int(len(waits) * p / 100))], 2) if waits else 0.0
+
+        return {
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms_total": round(total, 1),
+            "wait_ms_p50": pct(50),
+            "wait_ms_p95": pct(95),
+            "wait_ms_p99": pct(99),
+            "wait_ms_max": round(waits[-1], 2) if waits else 0.0,
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times each checkout, including any wait for a free
+    connection and the connect itself when the pool grows."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record((time.perf_counter() - started) * 1000, timed_out=True)
+            logger.error("Connection pool exhausted: %s", self.status())
+            raise
+        waited_ms = (time.perf_counter() - started) * 1000
+        self.metrics.record(waited_ms, timed_out=False)
+        stats = current_stats.get()
+        if stats is not None:
+            stats.pool_wait_ms += waited_ms
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def snapshot(self) -> dict:
+        capacity = self.size() + max(self._max_overflow, 0)
+        checked_out = self.checkedout()
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": checked_out,
+            "idle": self.checkedin(),
+            "saturation": round(checked_out / capacity, 2) if capacity else None,
+            **self.metrics.snapshot(),
+        }
+
+
+def pool_snapshot(engine: Engine) -> Optional[dict]:
+    pool = engine.pool
+    return pool.snapshot() if isinstance(pool, InstrumentedQueuePool) else None
+
+
+def _report(stats: QueryStats) -> None:
+    repeated = stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD)
+    for statement, times in repeated:
+        logger.warning(
+            "Possible N+1 in %s %s: statement ran %d times: %s",
+            stats.method, stats.path, times, _one_line(statement),
+        )
+        recent_n_plus_one.append({
+            "request": f"{stats.method} {stats.path}",
+            "times": times,
+            "statement": _one_line(statement),
+            "at": time.time(),
+        })
+    if stats.count:
+        logger.debug(
+            "%s %s: %d queries, %.1f ms in db, %.1f ms pool wait, slowest %s",
+            stats.method, stats.path, stats.count, stats.total_ms, stats.pool_wait_ms,
+            [round(ms, 1) for ms, _ in stats.slowest],
+        )
+
+
+class QueryStatsMiddleware:
+    """Collects ``QueryStats`` for each request, reports them in a
+    ``Server-Timing`` header (queries run before the response starts) and
+    checks the whole request, streamed body included, for N+1 patterns."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.DB_METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope["method"], scope["path"])
+        token = current_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_stats.reset(token)
+            _report(stats)
@@ -0,0 +1,90 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+# Clients may store responses but must revalidate them on every use; the
+# revalidation is what the cheap probe queries answer.
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the given version parts (ids, timestamps, counts).
+
+    Weak because the validator describes the resource version, not the exact
+    bytes — the body may be re-encoded or compressed differently.
+    """
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def collection_version(db: Session, model, *criteria) -> tuple[tuple, Optional[datetime]]:
+    """ETag parts and Last-Modified for the ``model`` rows matching ``criteria``.
+
+    Every insert moves ``max(created_at)``, every update ``max(updated_at)``
+    and every delete the count. The timestamps keep microseconds
+    (``database.Timestamp``), so this holds for writes within one second too,
+    and the probe reads only indexed columns, never the rows' text.
+    """
+    # One scalar subquery per aggregate, so each can be answered from its own index
+    count, created, updated = db.query(*(
+        db.query(aggregate).filter(*criteria).scalar_subquery()
+        for aggregate in (func.count(model.id), func.max(model.created_at), func.max(model.updated_at))
+    )).one()
+    changed = [t for t in (created, updated) if t is not None]
+    return (count, created, updated), max(changed) if changed else None
+
+
+def row_validators(db: Session, model, row_id: int) -> tuple[Optional[str], Optional[datetime]]:
+    """ETag/Last-Modified for one row without hydrating it; (None, None) if missing."""
+    row = db.query(model.created_at, model.updated_at).filter(model.id == row_id).first()
+    if row is None:
+        return None, None
+    return make_etag(model.__tablename__, row_id, *row), row.updated_at or row.created_at
+
+
+def _as_utc(dt: datetime) -> datetime:
+    # Timestamps come back naive from SQLite/MySQL but are stored as UTC
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def http_date(dt: datetime) -> str:
+    return format_datetime(_as_utc(dt).replace(microsecond=0), usegmt=True)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the
+    current validators, using weak comparison as RFC 9110 requires for GET."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [t.strip() for t in if_none_match.split(",")]
+        return "*" in candidates or any(_opaque(t) == _opaque(etag) for t in candidates)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
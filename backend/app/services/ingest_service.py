@@ -0,0 +1,92 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Literal, Optional
+
+# A single record (one JSONL line, or one CSV row including quoted newlines)
+# larger than this aborts the upload rather than buffering without bound.
+MAX_RECORD_CHARS = 1024 * 1024
+
+
+class UploadError(ValueError):
+    """The upload can't be parsed any further (bad encoding, oversized record)."""
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream into lines (with their endings) as it arrives."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+            if len(pending) > MAX_RECORD_CHARS:
+                raise UploadError(f"Record longer than {MAX_RECORD_CHARS} characters")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise UploadError(f"Upload is not valid UTF-8: {exc.reason}") from exc
+    if pending:
+        yield pending
+
+
+async def _jsonl_records(chunks: AsyncIterator[bytes]):
+    row = 0
+    async for line in _lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(value, dict):
+            yield row, None, "Expected a JSON object"
+            continue
+        yield row, value, None
+
+
+async def _csv_records(chunks: AsyncIterator[bytes]):
+    """CSV with a header row. A quoted field may span lines, so lines are
+    gathered until the record's quotes balance before it is parsed."""
+    header = None
+    record, quotes, row = "", 0, 0
+    async for line in _lines(chunks):
+        record += line
+        quotes += line.count('"')
+        if quotes % 2:
+            if len(record) > MAX_RECORD_CHARS:
+                raise UploadError(f"Record longer than {MAX_RECORD_CHARS} characters")
+            continue
+        text, record, quotes = record, "", 0
+        if not text.strip():
+            continue
+        fields = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in fields]
+            continue
+        row += 1
+        if len(fields) != len(header):
+            yield row, None, f"Expected {len(header)} columns, got {len(fields)}"
+            continue
+        # Empty cells are missing values, not empty strings
+        yield row, {name: value for name, value in zip(header, fields) if value != ""}, None
+    if record.strip():
+        yield row + 1, None, "Unterminated quoted field at end of upload"
+
+
+async def parse_records(
+    chunks: AsyncIterator[bytes], fmt: Literal["jsonl", "csv"]
+) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    """Yield ``(row, fields, error)`` for each record of a streamed upload.
+
+    Rows are numbered from 1 over data records (blank lines and the CSV
+    header don't count). A malformed record yields an error and parsing
+    continues; ``UploadError`` is raised only when the rest of the stream
+    can't be read.
+    """
+    records = _csv_records(chunks) if fmt == "csv" else _jsonl_records(chunks)
+    async for record in records:
+        yield record
@@ -1,47 +1,223 @@
 import logging
-from pinecone import Pinecone
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
 from langchain_pinecone import PineconeVectorStore
 from langchain_community.embeddings import FastEmbedEmbeddings
 from ..config import settings
+from .breaker_service import CircuitOpenError, guarded_call, pinecone_breaker
 
 logger = logging.getLogger(__name__)
 
-# Lightweight ONNX-based embeddings — no API key required, runs on CPU
-embeddings = FastEmbedEmbeddings(model_name="BAAI/bge-small-en-v1.5")
+# Vectors per Pinecone upsert request and texts per embedding pass in bulk upserts
+UPSERT_BATCH_SIZE = 100
+EMBEDDING_CHUNK_SIZE = 512
+# Metadata key PineconeVectorStore reads a document's text from
+TEXT_KEY = "text"
 
-pc = Pinecone(api_key=settings.PINECONE_API_KEY)
 
+@lru_cache(maxsize=1)
+def get_embeddings() -> FastEmbedEmbeddings:
+    # Lightweight ONNX-based embeddings — no API key required, runs on CPU.
+    # Loaded by the app's lifespan in the threadpool (or on first use from
+    # threadpool code), never on the event loop: the first call can take
+    # seconds and may download the model.
+    return FastEmbedEmbeddings(model_name="BAAI/bge-small-en-v1.5")
 
-def get_vector_store() -> PineconeVectorStore:
+
+@lru_cache(maxsize=8)
+def get_vector_store(namespace: Optional[str] = None) -> PineconeVectorStore:
+    # One store per namespace: construction resolves the index host with a
+    # blocking describe_index call (and loads the embeddings), so call this
+    # from the threadpool, inside the Pinecone breaker. Failures are not cached.
     return PineconeVectorStore(
         index_name=settings.PINECONE_INDEX_NAME,
-        embedding=embeddings,
+        embedding=get_embeddings(),
+        pinecone_api_key=settings.PINECONE_API_KEY,
+        namespace=namespace,
     )
 
 
+class PendingVectorWrites:
+    """Vector writes deferred while Pinecone is unavailable, replayed once it
+    recovers.
+
+    Keyed by (namespace, document id) and kept in write order, so only the
+    latest write to a document survives (a delete supersedes a queued
+    upsert). While anything is queued or being replayed, new writes join the
+    queue instead of going straight to Pinecone, so a replayed write can
+    never land on top of a newer one. The queue is bounded and in-process:
+    on overflow or restart the dropped documents stay stale in the index
+    until they are next written.
+    """
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        # (namespace, doc_id) -> (text, metadata, vector), or None for a delete;
+        # vectors are kept so a replay doesn't embed the documents again
+        self._ops: OrderedDict[tuple, Optional[tuple[str, dict, list[float]]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.replaying = False
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    @property
+    def busy(self) -> bool:
+        """True while writes must be queued to keep them in order."""
+        return self.replaying or bool(self._ops)
+
+    def _put(self, key: tuple, op: Optional[tuple[str, dict, list[float]]]) -> None:
+        self._ops.pop(key, None)
+        self._ops[key] = op
+        if len(self._ops) > self.max_items:
+            (_, dropped), _ = self._ops.popitem(last=False)
+            logger.error("Vector write queue full; dropped pending write for %s", dropped)
+
+    def put_upserts(
+        self, documents: list[tuple[str, str, dict]], vectors: list[list[float]], namespace: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            for (text, doc_id, metadata), vector in zip(documents, vectors):
+                self._put((namespace, doc_id), (text, metadata, vector))
+
+    def put_deletes(self, doc_ids: list[str], namespace: Optional[str] = None) -> None:
+        with self._lock:
+            for doc_id in doc_ids:
+                self._put((namespace, doc_id), None)
+
+    def take(self, limit: int) -> list[tuple[tuple, Optional[tuple[str, dict, list[float]]]]]:
+        with self._lock:
+            return [self._ops.popitem(last=False) for _ in range(min(limit, len(self._ops)))]
+
+    def restore(self, items: list[tuple[tuple, Optional[tuple[str, dict, list[float]]]]]) -> None:
+        """Put back taken items that failed to replay, unless superseded since."""
+        with self._lock:
+            for key, op in reversed(items):
+                if key not in self._ops:
+                    self._ops[key] = op
+                    self._ops.move_to_end(key, last=False)
+
+
+pending_writes = PendingVectorWrites(settings.VECTOR_QUEUE_MAX)
+
+
+async def _call(fn, /, *args, **kwargs):
+    return await guarded_call(pinecone_breaker, fn, *args, timeout=settings.PINECONE_TIMEOUT_SECONDS, **kwargs)
+
+
+def _embed(texts: list[str]) -> list[list[float]]:
+    vectors = []
+    for start in range(0, len(texts), EMBEDDING_CHUNK_SIZE):
+        vectors += get_embeddings().embed_documents(texts[start:start + EMBEDDING_CHUNK_SIZE])
+    return vectors
+
+
+def _upsert_vectors(
+    namespace: Optional[str], doc_ids: list[str], texts: list[str], vectors: list[list[float]], metadatas: list[dict]
+) -> None:
+    """Upsert already embedded documents, in the record format
+    ``PineconeVectorStore`` writes and reads."""
+    index = get_vector_store(namespace).index
+    records = [
+        (doc_id, vector, {**metadata, TEXT_KEY: text})
+        for doc_id, text, vector, metadata in zip(doc_ids, texts, vectors, metadatas)
+    ]
+    for start in range(0, len(records), UPSERT_BATCH_SIZE):
+        index.upsert(vectors=records[start:start + UPSERT_BATCH_SIZE], namespace=namespace)
+
+
+def _delete(namespace: Optional[str], doc_ids: list[str]) -> None:
+    get_vector_store(namespace).delete(ids=doc_ids)
+
+
 async def upsert_text(text: str, doc_id: str, metadata: dict) -> None:
     """Embed text and upsert a single document into Pinecone."""
-    if not text or not text.strip():
-        return
+    await upsert_texts([(text, doc_id, metadata)])
+
+
+async def upsert_texts(documents: list[tuple[str, str, dict]], namespace: Optional[str] = None) -> bool:
+    """Embed and upsert many ``(text, doc_id, metadata)`` documents in batches.
+
+    Embedding runs in the threadpool, outside the Pinecone breaker and
+    timeout: a large batch's CPU time says nothing about Pinecone's health.
+    Returns False if the batch could not be written now; it is then queued,
+    with its vectors, for replay (already logged).
+    """
+    documents = [doc for doc in documents if doc[0] and doc[0].strip()]
+    if not documents:
+        return True
+    texts, doc_ids, metadatas = (list(column) for column in zip(*documents))
+    try:
+        vectors = await run_in_threadpool(_embed, texts)
+    except Exception as exc:
+        logger.error("Failed to embed %d docs: %s", len(doc_ids), exc)
+        return False
+    if pending_writes.busy:
+        pending_writes.put_upserts(documents, vectors, namespace)
+        logger.info("Queued %d docs behind %d pending vector writes", len(doc_ids), len(pending_writes))
+        return False
     try:
-        store = get_vector_store()
-        store.add_texts(texts=[text], metadatas=[metadata], ids=[doc_id])
-        logger.info("Upserted doc %s to Pinecone", doc_id)
+        await _call(_upsert_vectors, namespace, doc_ids, texts, vectors, metadatas)
+        logger.info("Upserted %d docs to Pinecone", len(doc_ids))
+        return True
     except Exception as exc:
-        logger.error("Failed to upsert doc %s: %s", doc_id, exc)
+        logger.error("Failed to upsert %d docs, queued for replay: %s", len(doc_ids), exc)
+        pending_writes.put_upserts(documents, vectors, namespace)
+        return False
 
 
-async def delete_documents(doc_ids: list[str]) -> None:
+async def delete_documents(doc_ids: list[str], namespace: Optional[str] = None) -> None:
     """Delete one or more documents from Pinecone by ID."""
     if not doc_ids:
         return
+    if pending_writes.busy:
+        pending_writes.put_deletes(doc_ids, namespace)
+        logger.info("Queued deletion of %s behind pending vector writes", doc_ids)
+        return
     try:
-        index = pc.Index(settings.PINECONE_INDEX_NAME)
-        index.delete(ids=doc_ids)
+        await _call(_delete, namespace, doc_ids)
         logger.info("Deleted docs %s from Pinecone", doc_ids)
     except Exception as exc:
-        logger.error("Failed to delete docs %s: %s", doc_ids, exc)
+        logger.error("Failed to delete docs %s, queued for replay: %s", doc_ids, exc)
+        pending_writes.put_deletes(doc_ids, namespace)
+
+
+async def replay_pending_writes() -> int:
+    """Replay queued writes while Pinecone accepts them; returns how many were written."""
+    if pending_writes.replaying:
+        return 0
+    pending_writes.replaying = True
+    try:
+        return await _replay()
+    finally:
+        pending_writes.replaying = False
+
 
+async def _replay() -> int:
+    written = 0
+    while len(pending_writes):
+        items = pending_writes.take(UPSERT_BATCH_SIZE)
+        try:
+            for namespace in dict.fromkeys(ns for (ns, _), _ in items):
+                upserts = [(doc_id, *op) for (ns, doc_id), op in items if ns == namespace and op]
+                deletes = [doc_id for (ns, doc_id), op in items if ns == namespace and op is None]
+                if upserts:
+                    ids, texts, metadatas, vectors = (list(column) for column in zip(*upserts))
+                    await _call(_upsert_vectors, namespace, ids, texts, vectors, metadatas)
+                if deletes:
+                    await _call(_delete, namespace, deletes)
+        except CircuitOpenError:
+            pending_writes.restore(items)
+            break
+        except Exception as exc:
+            pending_writes.restore(items)
+            logger.warning("Replaying %d queued vector writes failed: %s", len(items), exc)
+            break
+        written += len(items)
+    if written:
+        logger.info("Replayed %d queued vector writes, %d left", written, len(pending_writes))
+    return written
 
-def get_retriever(k: int = 5):
-    return get_vector_store().as_retriever(search_kwargs={"k": k})
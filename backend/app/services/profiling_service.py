@@ -0,0 +1,276 @@
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from ..config import settings
+from .auth_service import decode_token
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+_PROFILE_ID = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{8}$")
+
+# Leaf frames of threads parked waiting for work (the event loop's selector,
+# idle threadpool workers); sampling them would only add noise.
+_IDLE_FUNCTIONS = {"select", "poll", "wait", "get", "_wait_for_tstate_lock"}
+_IDLE_MODULES = ("selectors.py", "threading.py", "queue.py")
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    path = Path(code.co_filename)
+    # co_qualname (Class.method) is new in Python 3.11
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({'/'.join(path.parts[-2:])}:{code.co_firstlineno})"
+
+
+def _collapse(thread_name: str, frame) -> Optional[str]:
+    """One stack in collapsed ("flamegraph") format, root first; None if idle."""
+    code = frame.f_code
+    if code.co_name in _IDLE_FUNCTIONS and code.co_filename.endswith(_IDLE_MODULES):
+        return None
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame).replace(";", ","))
+        frame = frame.f_back
+    names.append(thread_name)
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Statistical profiler sampling every thread's stack at a fixed interval.
+
+    One background thread serves every profile in progress: each subscriber
+    gets a ``Counter`` of collapsed stacks, and the thread exits when the
+    last one unsubscribes. Samples cover all threads, so requests running
+    concurrently with a profiled one show up in its profile too.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._subscribers: list[Counter] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.ignored: set[int] = set()
+
+    def subscribe(self) -> Counter:
+        counter = Counter()
+        with self._lock:
+            self._subscribers.append(counter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._thread.start()
+        return counter
+
+    def unsubscribe(self, counter: Counter) -> None:
+        with self._lock:
+            self._subscribers = [c for c in self._subscribers if c is not counter]
+
+    def _run(self) -> None:
+        try:
+            self._sample()
+        except Exception:
+            logger.exception("Profiler thread failed; it restarts with the next profile")
+            with self._lock:
+                self._thread = None
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+                subscribers = list(self._subscribers)
+            names = {t.ident: t.name for t in threading.enumerate()}
+            stacks = [
+                stack
+                for ident, frame in sys._current_frames().items()
+                if ident != own and ident not in self.ignored
+                and (stack := _collapse(names.get(ident, str(ident)), frame)) is not None
+            ]
+            for counter in subscribers:
+                counter.update(stacks)
+            time.sleep(self.interval)
+
+
+class ProfileStore:
+    """Bounded on-disk ring buffer of profiles: ``<id>.collapsed`` holds the
+    stacks, ``<id>.json`` the request metadata. Ids sort by capture time and
+    the oldest profiles are deleted beyond ``max_files``."""
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def save(self, profile_id: str, stacks: Counter, meta: dict) -> None:
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            body = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+            (self.directory / f"{profile_id}.collapsed").write_text(body)
+            (self.directory / f"{profile_id}.json").write_text(json.dumps(meta))
+            for stale in sorted(self.directory.glob("*.json"))[: -self.max_files]:
+                stale.unlink(missing_ok=True)
+                stale.with_suffix(".collapsed").unlink(missing_ok=True)
+
+    def list(self) -> list[dict]:
+        if not self.directory.is_dir():
+            return []
+        profiles = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                profiles.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue  # pruned or half-written while listing
+        return profiles
+
+    def path(self, profile_id: str) -> Optional[Path]:
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.collapsed"
+        return path if path.is_file() else None
+
+
+class _Capture:
+    __slots__ = ("id", "method", "path", "started", "reason", "counter", "profiled_from", "status", "streaming")
+
+    def __init__(self, scope, reason: Optional[str]):
+        self.id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.started = time.monotonic()
+        self.reason = reason
+        self.counter: Optional[Counter] = None
+        self.profiled_from = None
+        self.status = None
+        self.streaming = False
+
+
+class SlowRequestWatchdog:
+    """Starts profiling requests that run past the slow threshold.
+
+    A thread rather than event-loop timers, so a request blocking the loop
+    is still caught; the profile then covers the request from the threshold
+    on, which for a slow request is the part that matters.
+    """
+
+    def __init__(self, sampler: StackSampler, threshold: float):
+        self.sampler = sampler
+        self.threshold = threshold
+        self._active: dict[str, _Capture] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, capture: _Capture) -> None:
+        with self._lock:
+            self._active[capture.id] = capture
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="slow-request-watchdog", daemon=True)
+                self._thread.start()
+                self.sampler.ignored.add(self._thread.ident)
+
+    def untrack(self, capture: _Capture) -> None:
+        with self._lock:
+            self._active.pop(capture.id, None)
+
+    def _run(self) -> None:
+        poll = min(self.threshold / 4, 0.05)
+        while True:
+            time.sleep(poll)
+            now = time.monotonic()
+            with self._lock:
+                for capture in self._active.values():
+                    # Event streams stay open by design; they're profiled on request only
+                    if capture.counter is None and not capture.streaming and now - capture.started > self.threshold:
+                        capture.reason = "slow"
+                        capture.profiled_from = round((now - capture.started) * 1000, 1)
+                        capture.counter = self.sampler.subscribe()
+
+
+sampler = StackSampler(settings.PROFILE_INTERVAL_MS / 1000)
+store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_FILES)
+watchdog = SlowRequestWatchdog(sampler, settings.PROFILE_SLOW_MS / 1000)
+
+
+def _is_admin(authorization: Optional[str]) -> bool:
+    scheme, _, token = (authorization or "").partition(" ")
+    payload = decode_token(token) if scheme.lower() == "bearer" and token else None
+    return bool(payload) and payload.get("role") == "admin"
+
+
+class ProfilingMiddleware:
+    """Profiles a request, streaming body included, when an admin asks for it
+    with ``X-Profile: 1``, when it is picked by ``PROFILE_SAMPLE_RATE``, or
+    when it runs longer than ``PROFILE_SLOW_MS``. Profiles go to ``store``;
+    an explicitly requested one returns its id in ``X-Profile-Id``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.PROFILE_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        reason = None
+        if headers.get(PROFILE_HEADER) and _is_admin(headers.get("authorization")):
+            reason = "requested"
+        elif settings.PROFILE_SAMPLE_RATE and random.random() < settings.PROFILE_SAMPLE_RATE:
+            reason = "sampled"
+        capture = _Capture(scope, reason)
+        if reason:
+            capture.counter = sampler.subscribe()
+        elif settings.PROFILE_SLOW_MS > 0:
+            watchdog.track(capture)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                capture.status = message["status"]
+                response_headers = MutableHeaders(scope=message)
+                capture.streaming = response_headers.get("content-type", "").startswith("text/event-stream")
+                if reason == "requested":
+                    response_headers[PROFILE_ID_HEADER] = capture.id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            watchdog.untrack(capture)
+            if capture.counter is not None:
+                sampler.unsubscribe(capture.counter)
+                await self._save(capture)
+
+    @staticmethod
+    async def _save(capture: _Capture) -> None:
+        meta = {
+            "id": capture.id,
+            "reason": capture.reason,
+            "method": capture.method,
+            "path": capture.path,
+            "status": capture.status,
+            "duration_ms": round((time.monotonic() - capture.started) * 1000, 1),
+            "profiled_from_ms": capture.profiled_from or 0,
+            "samples": sum(capture.counter.values()),
+            "interval_ms": settings.PROFILE_INTERVAL_MS,
+            "captured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "pid": os.getpid(),
+        }
+        try:
+            await run_in_threadpool(store.save, capture.id, capture.counter, meta)
+        except OSError as exc:
+            logger.warning("Could not store profile %s: %s", capture.id, exc)
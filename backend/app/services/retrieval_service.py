@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from langchain_core.documents import Document
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import SessionLocal
+from ..models.experiment import Experiment
+from ..models.project import Project
+from . import pinecone_service
+from .breaker_service import guarded_call, pinecone_breaker
+
+logger = logging.getLogger(__name__)
+
+# What a project summary is built from: the embedding model only reads the
+# first ~512 tokens, so the description is clipped and the newest
+# experiments come first.
+SUMMARY_DESCRIPTION_CHARS = 1200
+SUMMARY_EXPERIMENTS = 25
+SUMMARY_RESULTS_CHARS = 120
+# Chunks the second stage searches; a project's description already feeds
+# its summary, which is what selected the project
+EXPERIMENT_CONTENT_TYPES = ["experiment_log", "experiment_results"]
+
+
+def summary_doc_id(project_id: int) -> str:
+    return f"project-{project_id}-summary"
+
+
+def summary_documents(db: Session, project_ids: list[int]) -> tuple[list[tuple[str, str, dict]], list[int]]:
+    """``(text, doc_id, metadata)`` summaries for the given projects, plus the
+    ids of those that no longer exist."""
+    projects = {p.id: p for p in db.query(Project).filter(Project.id.in_(project_ids))}
+    documents = []
+    for project_id in project_ids:
+        project = projects.get(project_id)
+        if project is None:
+            continue
+        experiments = (
+            db.query(Experiment.title, Experiment.results_text)
+            .filter(Experiment.project_id == project_id)
+            .order_by(Experiment.created_at.desc())
+            .limit(SUMMARY_EXPERIMENTS)
+            .all()
+        )
+        lines = [f"Project: {project.title}", "", (project.description or "")[:SUMMARY_DESCRIPTION_CHARS]]
+        if experiments:
+            lines += ["", "Experiments:"]
+            lines += [
+                f"- {title}: {results[:SUMMARY_RESULTS_CHARS]}" if results else f"- {title}"
+                for title, results in experiments
+            ]
+        documents.append((
+            "\n".join(lines),
+            summary_doc_id(project_id),
+            {
+                "user_id": project.user_id,
+                "project_id": project_id,
+                "project_title": project.title,
+                "content_type": "project_summary",
+            },
+        ))
+    return documents, [pid for pid in project_ids if pid not in projects]
+
+
+def _load_summaries(project_ids: list[int]):
+    with SessionLocal() as db:
+        return summary_documents(db, project_ids)
+
+
+async def refresh_summaries(project_ids: list[int]) -> None:
+    """Re-embed the summaries of ``project_ids``; deleted projects lose theirs."""
+    documents, missing = await run_in_threadpool(_load_summaries, project_ids)
+    namespace = settings.PINECONE_SUMMARY_NAMESPACE
+    if documents:
+        await pinecone_service.upsert_texts(documents, namespace=namespace)
+    if missing:
+        await pinecone_service.delete_documents([summary_doc_id(pid) for pid in missing], namespace=namespace)
+
+
+class SummaryRefresher:
+    """Coalesces summary refreshes: routers mark projects dirty after each
+    write and one task re-embeds them ``delay`` seconds later, so a burst of
+    writes to a project (e.g. a bulk import) costs one embedding.
+
+    ``mark`` may be called from the event loop or from threadpool code (sync
+    handlers); the latter is handed to the loop given to ``bind``.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._dirty: set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def mark(self, project_id: int) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if self._loop is None:
+                logger.warning("No event loop bound; summary of project %s not refreshed", project_id)
+                return
+            self._loop.call_soon_threadsafe(self._mark, project_id)
+            return
+        self._mark(project_id)
+
+    def _mark(self, project_id: int) -> None:
+        self._dirty.add(project_id)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.delay)
+            project_ids, self._dirty = sorted(self._dirty), set()
+            try:
+                await refresh_summaries(project_ids)
+            except Exception as exc:
+                logger.error("Refreshing summaries of projects %s failed: %s", project_ids, exc)
+
+
+summary_refresher = SummaryRefresher(settings.SUMMARY_REFRESH_DELAY_SECONDS)
+
+
+def _similarity_search(namespace: Optional[str], embedding: list[float], k: int, filter: Optional[dict]):
+    store = pinecone_service.get_vector_store(namespace)
+    return store.similarity_search_by_vector_with_score(embedding, k=k, filter=filter)
+
+
+async def _search(namespace: Optional[str], embedding: list[float], k: int, filter: Optional[dict] = None):
+    return await guarded_call(
+        pinecone_breaker, _similarity_search, namespace, embedding, k, filter,
+        timeout=settings.PINECONE_TIMEOUT_SECONDS,
+    )
+
+
+async def retrieve(query: str, k: int = 6) -> list[Document]:
+    """Two-stage retrieval: pick the ``RETRIEVAL_PROJECTS`` projects whose
+    summaries best match ``query``, then search each one's experiment chunks
+    in parallel and interleave the hits by project rank, so no single
+    project can fill every slot. Falls back to a flat top-``k`` search when no
+    summaries exist yet (index not backfilled) or they lead nowhere.
+    """
+    embedding = await run_in_threadpool(lambda: pinecone_service.get_embeddings().embed_query(query))
+    summaries = await _search(settings.PINECONE_SUMMARY_NAMESPACE, embedding, settings.RETRIEVAL_PROJECTS)
+    project_ids = list(dict.fromkeys(int(doc.metadata["project_id"]) for doc, _ in summaries))
+
+    if project_ids:
+        per_project = -(-k // len(project_ids))
+        hits = await asyncio.gather(*(
+            _search(
+                None, embedding, per_project,
+                filter={"project_id": project_id, "content_type": {"$in": EXPERIMENT_CONTENT_TYPES}},
+            )
+            for project_id in project_ids
+        ))
+        # Round-robin over projects in summary rank order
+        docs = [
+            project_hits[i][0]
+            for i in range(per_project)
+            for project_hits in hits
+            if i < len(project_hits)
+        ][:k]
+        if docs:
+            return docs
+    return [doc for doc, _ in await _search(None, embedding, k)]
@@ -0,0 +1,30 @@
+"""Compare two benchmark result files and fail on regressions.
+
+    python -m benchmarks.compare results/load.json baselines/load.json --tolerance 0.15
+"""
+import argparse
+import sys
+
+from .stats import compare, load_results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("current")
+    parser.add_argument("baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed relative regression (default 0.10 = 10%%)")
+    args = parser.parse_args()
+
+    regressions = compare(load_results(args.current), load_results(args.baseline), args.tolerance)
+    if regressions:
+        print("Regressions beyond tolerance:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("No regressions beyond tolerance.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
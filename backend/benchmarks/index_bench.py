@@ -0,0 +1,194 @@
+"""Query plans and latency of the hot ORM queries with and without the model indexes.
+
+    python -m benchmarks.index_bench                          # temp SQLite database
+    python -m benchmarks.index_bench --projects 2000 --experiments 20
+    python -m benchmarks.index_bench --url mysql+pymysql://user:pw@host/scratch_db
+
+Seeds large ``projects``/``experiments`` tables, drops the indexes declared
+in ``__table_args__`` to reproduce a database created before they existed,
+times each query and captures its plan, then applies them with
+``ensure_indexes`` (the same path the app runs at startup) and repeats.
+
+``--url`` must point at a scratch database: its tables are dropped and
+recreated.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from .micro import BACKEND_DIR, LOG_TEXT, measure
+from .stats import print_table, write_results
+
+SEED_BATCH = 5_000
+
+
+def _probe(model, *criteria):
+    """The validator probe ``etag_service.collection_version`` issues."""
+    from sqlalchemy import func, select
+
+    return select(*(
+        select(aggregate).where(*criteria).scalar_subquery()
+        for aggregate in (func.count(model.id), func.max(model.created_at), func.max(model.updated_at))
+    ))
+
+
+def _queries(Project, Experiment, ProjectStatus, project_id: int, user_id: int) -> dict:
+    """The statements the routers issue, keyed by benchmark name."""
+    from sqlalchemy import func, select
+
+    return {
+        # experiments.list_experiments and its validator probe
+        "list_experiments": select(Experiment)
+        .where(Experiment.project_id == project_id)
+        .order_by(Experiment.created_at.desc()),
+        "experiments_probe": _probe(Experiment, Experiment.project_id == project_id),
+        # projects.list_projects validator probe
+        "projects_probe": _probe(Project),
+        # projects.list_projects, first dashboard page
+        "list_projects_page": select(Project).order_by(Project.created_at.desc()).limit(50),
+        "projects_by_status_page": select(Project)
+        .where(Project.status == ProjectStatus.active)
+        .order_by(Project.created_at.desc(), Project.id.desc())
+        .limit(50),
+        # stats.get_stats
+        "stats_by_status": select(Project.status, func.count(Project.id)).group_by(Project.status),
+        # users.delete_user ownership lookup
+        "projects_for_user": select(Project.id).where(Project.user_id == user_id),
+    }
+
+
+def _explain(conn, stmt) -> str:
+    from sqlalchemy import text
+
+    sql = str(stmt.compile(conn.engine, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        return "; ".join(row[-1] for row in rows)
+    rows = conn.execute(text(f"EXPLAIN {sql}")).mappings().all()
+    return "; ".join(
+        f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']} {row.get('Extra') or ''}".strip()
+        for row in rows
+    )
+
+
+def _seed(engine, tables, n_projects: int, n_experiments: int) -> None:
+    from app.models.project import ProjectStatus
+
+    users, projects, experiments = tables
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    statuses = list(ProjectStatus)
+    with engine.begin() as conn:
+        conn.execute(users.insert(), [
+            {"id": i, "email": f"user{i}@example.org", "name": f"User {i}",
+             "password_hash": "x", "role": "researcher"}
+            for i in range(1, 51)
+        ])
+    for offset in range(0, n_projects, SEED_BATCH):
+        ids = range(offset + 1, min(offset + SEED_BATCH, n_projects) + 1)
+        with engine.begin() as conn:
+            conn.execute(projects.insert(), [
+                {"id": i, "user_id": rng.randint(1, 50), "title": f"Project {i}",
+                 "description": LOG_TEXT[:300], "status": rng.choice(statuses).name,
+                 "created_at": start + timedelta(minutes=rng.randint(0, 500_000))}
+                for i in ids
+            ])
+
+    total = n_projects * n_experiments
+    for offset in range(0, total, SEED_BATCH):
+        with engine.begin() as conn:
+            conn.execute(experiments.insert(), [
+                {"project_id": rng.randint(1, n_projects), "title": f"Assay {i}",
+                 "log_text": LOG_TEXT[:400], "results_text": "Viability 91% relative to control.",
+                 "created_at": start + timedelta(minutes=rng.randint(0, 500_000))}
+                for i in range(offset, min(offset + SEED_BATCH, total))
+            ])
+
+
+def _run_phase(engine, queries: dict, min_time: float) -> dict:
+    phase = {}
+    with engine.connect() as conn:
+        for name, stmt in queries.items():
+            timing = measure(lambda: conn.execute(stmt).all(), min_time=min_time, rounds=5)
+            phase[name] = {"median_ms": timing["median_ms"], "plan": _explain(conn, stmt)}
+    return phase
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="scratch database URL (default: a temporary SQLite file)")
+    parser.add_argument("--projects", type=int, default=20_000)
+    parser.add_argument("--experiments", type=int, default=25, help="experiments per project, on average")
+    parser.add_argument("--quick", action="store_true", help="shorter timing windows")
+    parser.add_argument("--out", default="benchmarks/results/index.json")
+    args = parser.parse_args()
+
+    out = Path(args.out).resolve()
+    os.chdir(tempfile.mkdtemp(prefix="bench-index-"))
+    os.environ["MYSQL_HOST"] = ""
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from sqlalchemy import create_engine
+    from app.database import Base, ensure_indexes
+    from app.models import Experiment, Project, User
+    from app.models.project import ProjectStatus
+
+    url = args.url or f"sqlite:///{Path('index_bench.db').resolve()}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    for model in (Project, Experiment):
+        for index in model.__table_args__:
+            index.drop(engine)
+
+    print(f"seeding {args.projects} projects, {args.projects * args.experiments} experiments...",
+          file=sys.stderr)
+    started = time.perf_counter()
+    _seed(engine, (User.__table__, Project.__table__, Experiment.__table__),
+          args.projects, args.experiments)
+    print(f"seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    queries = _queries(Project, Experiment, ProjectStatus, args.projects // 2, 25)
+    min_time = 0.3 if args.quick else 1.0
+
+    print("timing without indexes...", file=sys.stderr)
+    before = _run_phase(engine, queries, min_time)
+    started = time.perf_counter()
+    created = ensure_indexes(engine)
+    build_s = time.perf_counter() - started
+    print(f"created {', '.join(created)} in {build_s:.1f}s", file=sys.stderr)
+    print("timing with indexes...", file=sys.stderr)
+    after = _run_phase(engine, queries, min_time)
+
+    results = {
+        name: {
+            "no_index_ms": before[name]["median_ms"],
+            "indexed_ms": after[name]["median_ms"],
+            "speedup": round(before[name]["median_ms"] / after[name]["median_ms"], 1)
+            if after[name]["median_ms"] else None,
+            "plan_no_index": before[name]["plan"],
+            "plan_indexed": after[name]["plan"],
+        }
+        for name in queries
+    }
+    print_table(results, ["no_index_ms", "indexed_ms", "speedup"])
+    print()
+    for name, metrics in results.items():
+        print(f"{name}\n  before: {metrics['plan_no_index']}\n  after:  {metrics['plan_indexed']}")
+
+    write_results(
+        out, results, benchmark="index", dialect=engine.dialect.name,
+        projects=args.projects, experiments=args.projects * args.experiments,
+        index_build_s=round(build_s, 2),
+    )
+    print(f"\nResults written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""End-to-end load test against the app with local dependency stand-ins.
+
+Starts ``benchmarks.serve`` in a subprocess (or targets ``--url``), seeds users,
+projects and experiments over HTTP, then drives a mixed workload:
+
+* API users loop over a weighted mix of login, project reads, experiment
+  reads and experiment create/update/delete;
+* chat users hold concurrent ``/api/chat/stream`` SSE streams.
+
+Reports throughput and p50/p95/p99 latency per operation plus chat
+time-to-first-token, and optionally compares against a saved baseline::
+
+    python -m benchmarks.load_test --duration 30 --out benchmarks/results/load.json
+    python -m benchmarks.load_test --baseline benchmarks/baselines/load.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+from .stats import compare, load_results, print_table, summarize, write_results
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PASSWORD = "bench-password-123"
+
+API_MIX = {
+    "login": 5,
+    "list_projects": 35,
+    "get_project": 15,
+    "list_experiments": 20,
+    "get_experiment": 5,
+    "create_experiment": 8,
+    "update_experiment": 7,
+    "delete_experiment": 5,
+}
+
+LOG_TEXT = (
+    "Run {n}: incubated cell line HEK293 at 37C for 48h, measured viability by MTT "
+    "assay, absorbance read at 570nm. Replicate variance within tolerance. " * 4
+)
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.ttft: list[float] = []
+
+    def record(self, op: str, elapsed: float, ok: bool) -> None:
+        if ok:
+            self.latencies[op].append(elapsed)
+        else:
+            self.errors[op] += 1
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_healthy(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/api/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError("server did not become healthy")
+
+
+async def _register(client: httpx.AsyncClient, role: str = "researcher") -> dict:
+    email = f"bench-{uuid.uuid4().hex[:10]}@example.com"
+    resp = await client.post(
+        "/api/auth/register",
+        json={"name": "Bench User", "email": email, "password": PASSWORD, "role": role},
+    )
+    resp.raise_for_status()
+    body = resp.json()
+    return {"email": email, "id": body["user"]["id"], "token": body["access_token"]}
+
+
+def _auth(user: dict) -> dict:
+    return {"Authorization": f"Bearer {user['token']}"}
+
+
+async def seed(client: httpx.AsyncClient, users: list[dict], projects: int, experiments: int) -> dict:
+    project_ids: list[int] = []
+    experiment_ids: dict[int, list[int]] = defaultdict(list)
+    for p in range(projects):
+        owner = users[p % len(users)]
+        resp = await client.post(
+            "/api/projects",
+            headers=_auth(owner),
+            json={"title": f"Oncology cohort study {p}",
+                  "description": f"Longitudinal biomarker study {p} tracking tumour response."},
+        )
+        resp.raise_for_status()
+        pid = resp.json()["id"]
+        project_ids.append(pid)
+        for e in range(experiments):
+            resp = await client.post(
+                f"/api/projects/{pid}/experiments",
+                headers=_auth(owner),
+                json={"title": f"Assay run {e}", "log_text": LOG_TEXT.format(n=e),
+                      "results_text": f"Viability {80 + e % 15}% relative to control."},
+            )
+            resp.raise_for_status()
+            experiment_ids[pid].append(resp.json()["id"])
+    return {"projects": project_ids, "experiments": experiment_ids}
+
+
+async def api_user(client, user, corpus, recorder, stop_at, rng):
+    ops, weights = zip(*API_MIX.items())
+    own: list[tuple[int, int]] = []  # (project_id, experiment_id) this user created
+    owned = sorted(corpus["owned"][user["id"]])
+    while time.monotonic() < stop_at:
+        op = rng.choices(ops, weights)[0]
+        pid = rng.choice(corpus["projects"])
+        if op in ("update_experiment", "delete_experiment") and not own:
+            op = "create_experiment"
+        if op == "create_experiment" and not owned:
+            op = "list_projects"
+        start = time.perf_counter()
+        try:
+            if op == "login":
+                resp = await client.post("/api/auth/login",
+                                         json={"email": user["email"], "password": PASSWORD})
+            elif op == "list_projects":
+                resp = await client.get("/api/projects", headers=_auth(user))
+            elif op == "get_project":
+                resp = await client.get(f"/api/projects/{pid}", headers=_auth(user))
+            elif op == "list_experiments":
+                resp = await client.get(f"/api/projects/{pid}/experiments", headers=_auth(user))
+            elif op == "get_experiment":
+                eid = rng.choice(corpus["experiments"][pid] or [0])
+                resp = await client.get(f"/api/experiments/{eid}", headers=_auth(user))
+            elif op == "create_experiment":
+                pid = rng.choice(owned)
+                resp = await client.post(
+                    f"/api/projects/{pid}/experiments", headers=_auth(user),
+                    json={"title": "Load run", "log_text": LOG_TEXT.format(n=rng.randint(0, 999))},
+                )
+                if resp.status_code == 201:
+                    own.append((pid, resp.json()["id"]))
+            elif op == "update_experiment":
+                _, eid = rng.choice(own)
+                resp = await client.put(f"/api/experiments/{eid}", headers=_auth(user),
+                                        json={"results_text": "Updated viability 91%."})
+            else:  # delete_experiment
+                _, eid = own.pop(rng.randrange(len(own)))
+                resp = await client.delete(f"/api/experiments/{eid}", headers=_auth(user))
+            ok = resp.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        recorder.record(op, time.perf_counter() - start, ok)
+
+
+async def chat_user(client, user, recorder, stop_at, rng):
+    session_id = str(uuid.uuid4())
+    questions = ["What did the viability assays show?",
+                 "Which projects studied tumour response?",
+                 "Summarise the latest assay run."]
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        first = None
+        ok = True
+        try:
+            async with client.stream(
+                "POST", "/api/chat/stream", headers=_auth(user),
+                json={"message": rng.choice(questions), "session_id": session_id},
+            ) as resp:
+                ok = resp.status_code == 200
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[6:]
+                    if data == "[DONE]":
+                        break
+                    if '"error"' in data and "error" in json.loads(data):
+                        ok = False
+                    elif first is None:
+                        first = time.perf_counter() - start
+        except httpx.HTTPError:
+            ok = False
+        recorder.record("chat_stream", time.perf_counter() - start, ok)
+        if ok and first is not None:
+            recorder.ttft.append(first)
+
+
+async def run(args) -> dict:
+    base_url = args.url
+    server = None
+    if base_url is None:
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.serve", "--port", str(port),
+             "--first-token-ms", str(args.first_token_ms), "--token-ms", str(args.token_ms),
+             "--tokens", str(args.tokens), "--stall-rate", str(args.stall_rate),
+             "--stall-ms", str(args.stall_ms), "--backends", str(args.backends)],
+            cwd=BACKEND_DIR,
+        )
+    limits = httpx.Limits(max_connections=args.users + args.chat_users + 10)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+            await _wait_healthy(client)
+            users = [await _register(client) for _ in range(args.users)]
+            corpus = await seed(client, users, args.projects, args.experiments)
+            corpus["owned"] = defaultdict(set)
+            for i, pid in enumerate(corpus["projects"]):
+                corpus["owned"][users[i % len(users)]["id"]].add(pid)
+
+            recorder = Recorder()
+            rng = random.Random(args.seed)
+            started = time.monotonic()
+            stop_at = started + args.duration
+            await asyncio.gather(
+                *(api_user(client, u, corpus, recorder, stop_at, random.Random(rng.random()))
+                  for u in users),
+                *(chat_user(client, users[i % len(users)], recorder, stop_at, random.Random(rng.random()))
+                  for i in range(args.chat_users)),
+            )
+            elapsed = time.monotonic() - started
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    results = {}
+    total = 0
+    for op in sorted(set(recorder.latencies) | set(recorder.errors)):
+        samples = recorder.latencies[op]
+        total += len(samples)
+        results[op] = {
+            **summarize(samples),
+            "throughput_rps": round(len(samples) / elapsed, 2),
+            "errors": recorder.errors[op],
+        }
+    results["chat_ttft"] = summarize(recorder.ttft)
+    results["overall"] = {
+        "throughput_rps": round(total / elapsed, 2),
+        "errors": sum(recorder.errors.values()),
+        "duration_s_wall": round(elapsed, 1),
+    }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None, help="target a running server instead of spawning one")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of measured load")
+    parser.add_argument("--users", type=int, default=20, help="concurrent API users")
+    parser.add_argument("--chat-users", type=int, default=5, help="concurrent chat streams")
+    parser.add_argument("--projects", type=int, default=40)
+    parser.add_argument("--experiments", type=int, default=10, help="experiments per seeded project")
+    parser.add_argument("--first-token-ms", type=float, default=300)
+    parser.add_argument("--token-ms", type=float, default=20)
+    parser.add_argument("--tokens", type=int, default=60)
+    parser.add_argument("--stall-rate", type=float, default=0.0,
+                        help="fraction of chat streams whose primary LLM stalls before its first token")
+    parser.add_argument("--stall-ms", type=float, default=10_000)
+    parser.add_argument("--backends", type=int, default=1, help="fake LLM backends to hedge across")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="benchmarks/results/load.json")
+    parser.add_argument("--baseline", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_table(results, ["count", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "errors"])
+    write_results(args.out, results, benchmark="load_test",
+                  config={k: v for k, v in vars(args).items() if k not in ("out", "baseline", "url")})
+    print(f"\nResults written to {args.out}")
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.tolerance)
+        if regressions:
+            print("Regressions beyond tolerance:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions beyond tolerance.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
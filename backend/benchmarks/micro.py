@@ -0,0 +1,304 @@
+"""Micro-benchmarks for individual hot paths, written as comparable JSON.
+
+    python -m benchmarks.micro                       # full suite
+    python -m benchmarks.micro --only auth,serialize # subset by group
+    python -m benchmarks.micro --quick               # shorter timing windows
+
+Groups:
+
+* ``embed``     — ``pinecone_service`` query and batch embedding throughput
+  (FastEmbed when the model is available, the stub embeddings otherwise)
+* ``vector``    — top-k latency of brute-force vector search by index size
+* ``context``   — ``chat_service.build_context`` for typical retrieval sizes
+* ``auth``      — JWT create/decode and bcrypt hash/verify
+* ``serialize`` — ``ProjectResponse``/``ExperimentResponse`` list serialization
+  from ORM objects, as FastAPI does for ``response_model``
+* ``listing``   — a 1,000-experiment listing end to end from SQLite: ORM rows
+  through ``response_model`` vs column rows through the orjson fast path,
+  plus gzip/Brotli encoding of the result
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from .stats import percentile, print_table, write_results
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+LOG_TEXT = (
+    "Incubated HEK293 at 37C for 48h; viability by MTT assay, absorbance at 570nm. "
+    "Replicate variance within tolerance; no contamination observed. "
+) * 20
+
+
+def measure(fn: Callable[[], object], *, items: int = 1, min_time: float = 1.0, rounds: int = 7) -> dict:
+    """Time ``fn`` over ``rounds`` rounds of an auto-calibrated loop count.
+
+    ``items`` is how many units of work one call performs (e.g. batch size),
+    so ``items_per_sec`` stays comparable across batch sizes.
+    """
+    fn()  # warm up caches, lazy imports, JIT-ish paths in C extensions
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / rounds or number >= 1_000_000:
+            break
+        number *= 2 if elapsed == 0 else max(2, int((min_time / rounds) / elapsed) + 1)
+
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - start) / number)
+    per_call.sort()
+    median = percentile(per_call, 50)
+    return {
+        "calls": number * rounds,
+        "median_ms": round(median * 1000, 4),
+        "min_ms": round(per_call[0] * 1000, 4),
+        "items_per_sec": round(items / median, 1) if median else None,
+    }
+
+
+def bench_embed(args) -> dict:
+    """Embed through ``pinecone_service`` as the app does: ``embed_query`` for
+    chat questions, ``_embed`` (chunked ``embed_documents``) for upserts.
+
+    Without the FastEmbed model (e.g. offline) the same wrapper is timed over
+    the stub embeddings instead, under ``embed_stub_*`` names so the two are
+    never compared against each other.
+    """
+    from app.services import pinecone_service
+
+    prefix = "embed"
+    try:
+        embeddings = pinecone_service.get_embeddings()
+    except Exception as exc:
+        from .stubs import HashingEmbeddings
+
+        print(f"FastEmbed model unavailable, timing stub embeddings: {exc}"[:200], file=sys.stderr)
+        stub = HashingEmbeddings(384)
+        pinecone_service.get_embeddings = lambda: stub
+        embeddings, prefix = stub, "embed_stub"
+
+    query = "Which assays measured HEK293 viability at 48h?"
+    results = {f"{prefix}_query": measure(lambda: embeddings.embed_query(query), min_time=args.min_time)}
+    for batch in (1, 8, 32, 128):
+        texts = [f"Experiment {i}\nLog:\n{LOG_TEXT[:600]}" for i in range(batch)]
+        results[f"{prefix}_batch_{batch}"] = measure(
+            lambda: pinecone_service._embed(texts), items=batch, min_time=args.min_time
+        )
+    return results
+
+
+def bench_vector(args) -> dict:
+    import numpy as np
+    from .stubs import LocalVectorStore, HashingEmbeddings
+
+    rng = np.random.default_rng(0)
+    results = {}
+    for size in (1_000, 10_000, 50_000):
+        store = LocalVectorStore(HashingEmbeddings(384))
+        vectors = rng.standard_normal((size, 384)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        store._ids = [f"doc-{i}" for i in range(size)]
+        store._texts = ["text"] * size
+        store._metadatas = [{"project_id": i % 200} for i in range(size)]
+        store._vectors = vectors.tolist()
+        query = vectors[0].tolist()
+        results[f"vector_top6_{size}"] = measure(
+            lambda: store.similarity_search_by_vector(query, k=6), min_time=args.min_time
+        )
+    return results
+
+
+def bench_context(args) -> dict:
+    from langchain_core.documents import Document
+    from app.services.chat_service import build_context
+
+    results = {}
+    for n in (6, 24):
+        docs = [
+            Document(
+                page_content=f"Experiment: Assay {i}\nLog:\n{LOG_TEXT}",
+                metadata={"content_type": "experiment_log", "project_title": f"Project {i % 4}"},
+            )
+            for i in range(n)
+        ]
+        results[f"context_build_{n}_docs"] = measure(
+            lambda: build_context(docs), items=n, min_time=args.min_time
+        )
+    return results
+
+
+def bench_auth(args) -> dict:
+    from app.services.auth_service import (
+        create_access_token, decode_token, hash_password, verify_password,
+    )
+
+    token = create_access_token({"sub": "42", "role": "researcher"})
+    hashed = hash_password("correct horse battery staple")
+    return {
+        "jwt_create": measure(
+            lambda: create_access_token({"sub": "42", "role": "researcher"}), min_time=args.min_time
+        ),
+        "jwt_decode": measure(lambda: decode_token(token), min_time=args.min_time),
+        "bcrypt_hash": measure(
+            lambda: hash_password("correct horse battery staple"), min_time=args.min_time, rounds=3
+        ),
+        "bcrypt_verify": measure(
+            lambda: verify_password("correct horse battery staple", hashed),
+            min_time=args.min_time, rounds=3,
+        ),
+    }
+
+
+def bench_serialize(args) -> dict:
+    from typing import List
+    from pydantic import TypeAdapter
+    from app.models import Experiment, Project
+    from app.models.project import ProjectStatus
+    from app.schemas.experiment import ExperimentResponse
+    from app.schemas.project import ProjectResponse
+
+    now = datetime.now(timezone.utc)
+    projects_adapter = TypeAdapter(List[ProjectResponse])
+    experiments_adapter = TypeAdapter(List[ExperimentResponse])
+    results = {}
+    for n in (100, 1_000, 5_000):
+        projects = [
+            Project(id=i, user_id=i % 20, title=f"Project {i}", description=LOG_TEXT[:400],
+                    status=ProjectStatus.active, created_at=now, updated_at=now)
+            for i in range(n)
+        ]
+        experiments = [
+            Experiment(id=i, project_id=i % 50, title=f"Assay {i}", log_text=LOG_TEXT,
+                       results_text="Viability 91% relative to control.", created_at=now)
+            for i in range(n)
+        ]
+        results[f"serialize_projects_{n}"] = measure(
+            lambda: projects_adapter.dump_json(
+                projects_adapter.validate_python(projects, from_attributes=True)
+            ),
+            items=n, min_time=args.min_time, rounds=5,
+        )
+        results[f"serialize_experiments_{n}"] = measure(
+            lambda: experiments_adapter.dump_json(
+                experiments_adapter.validate_python(experiments, from_attributes=True)
+            ),
+            items=n, min_time=args.min_time, rounds=5,
+        )
+    return results
+
+
+def bench_listing(args) -> dict:
+    import gzip
+    import json
+    from fastapi.encoders import jsonable_encoder
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.database import Base
+    from app.models import Experiment, Project, User
+    from app.schemas.experiment import ExperimentResponse
+    from app.services.compression_service import brotli
+    from app.services.serialization_service import response_columns, rows_json
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(User(id=1, name="Bench", email="bench@example.org", password_hash="x"))
+        db.add(Project(id=1, user_id=1, title="Project", description=LOG_TEXT[:200]))
+        db.add_all(
+            Experiment(project_id=1, title=f"Assay {i}", log_text=LOG_TEXT,
+                       results_text="Viability 91% relative to control.")
+            for i in range(1_000)
+        )
+        db.commit()
+    columns = response_columns(Experiment, ExperimentResponse)
+
+    def response_model():
+        # What FastAPI does for response_model: validate, jsonable_encoder, json.dumps
+        with Session(engine) as db:
+            rows = db.query(Experiment).filter(Experiment.project_id == 1).all()
+            validated = [ExperimentResponse.model_validate(row) for row in rows]
+            return json.dumps(jsonable_encoder(validated)).encode()
+
+    def fast_path():
+        with Session(engine) as db:
+            return rows_json(db.query(*columns).filter(Experiment.project_id == 1).all(), ExperimentResponse)
+
+    body = fast_path()
+    results = {
+        "listing_1000_response_model": measure(response_model, items=1_000, min_time=args.min_time, rounds=5),
+        "listing_1000_orjson_columns": measure(fast_path, items=1_000, min_time=args.min_time, rounds=5),
+        "listing_1000_gzip": {
+            **measure(lambda: gzip.compress(body, 5), min_time=args.min_time, rounds=5),
+            "bytes": len(body), "encoded_bytes": len(gzip.compress(body, 5)),
+        },
+    }
+    if brotli is not None:
+        results["listing_1000_brotli"] = {
+            **measure(lambda: brotli.compress(body, quality=4), min_time=args.min_time, rounds=5),
+            "bytes": len(body), "encoded_bytes": len(brotli.compress(body, quality=4)),
+        }
+    else:
+        results["listing_1000_brotli"] = {"skipped": "brotli not installed"}
+    engine.dispose()
+    return results
+
+
+GROUPS = {
+    "embed": bench_embed,
+    "vector": bench_vector,
+    "context": bench_context,
+    "auth": bench_auth,
+    "serialize": bench_serialize,
+    "listing": bench_listing,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", default=",".join(GROUPS), help="comma-separated groups to run")
+    parser.add_argument("--quick", action="store_true", help="shorter timing windows")
+    parser.add_argument("--out", default="benchmarks/results/micro.json")
+    args = parser.parse_args()
+    args.min_time = 0.3 if args.quick else 1.0
+
+    # The app modules read settings at import: keep any developer .env out of
+    # the run and make app.database fall back to SQLite.
+    out = Path(args.out).resolve()
+    os.chdir(tempfile.mkdtemp(prefix="bench-micro-"))
+    os.environ["MYSQL_HOST"] = ""
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    results = {}
+    for group in args.only.split(","):
+        group = group.strip()
+        if group not in GROUPS:
+            parser.error(f"unknown group {group!r}; choose from {', '.join(GROUPS)}")
+        print(f"running {group}...", file=sys.stderr)
+        results.update(GROUPS[group](args))
+
+    for name, metrics in results.items():
+        if "skipped" in metrics:
+            print(f"{name}: skipped ({metrics['skipped']})")
+    print_table(
+        {name: m for name, m in results.items() if "skipped" not in m},
+        ["calls", "median_ms", "min_ms", "items_per_sec"],
+    )
+    write_results(out, results, benchmark="micro", groups=args.only)
+    print(f"\nResults written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Run ``app.main:app`` with local stand-ins for Groq, Pinecone and Redis.
+
+    python -m benchmarks.serve --port 8100 --db-dir /tmp/bench
+
+The database is a fresh SQLite file in ``--db-dir``; no ``.env`` is read.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--db-dir", default=None, help="directory for the SQLite file (default: temp dir)")
+    parser.add_argument("--first-token-ms", type=float, default=300)
+    parser.add_argument("--token-ms", type=float, default=20)
+    parser.add_argument("--tokens", type=int, default=60)
+    parser.add_argument("--stall-rate", type=float, default=0.0,
+                        help="fraction of chat streams whose primary LLM stalls before its first token")
+    parser.add_argument("--stall-ms", type=float, default=10_000)
+    parser.add_argument("--backends", type=int, default=1, help="fake LLM backends to hedge across")
+    args = parser.parse_args()
+
+    # Point the app at SQLite and keep any developer .env out of the run:
+    # settings resolve .env relative to the working directory.
+    db_dir = Path(args.db_dir or tempfile.mkdtemp(prefix="bench-"))
+    db_dir.mkdir(parents=True, exist_ok=True)
+    os.chdir(db_dir)
+    os.environ["MYSQL_HOST"] = ""
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from benchmarks import stubs
+
+    stubs.install(
+        first_token_latency=args.first_token_ms / 1000,
+        token_latency=args.token_ms / 1000,
+        tokens=args.tokens,
+        stall_rate=args.stall_rate,
+        stall_latency=args.stall_ms / 1000,
+        backends=args.backends,
+    )
+
+    import uvicorn
+    from app.main import app
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Sustained read/write throughput of the SQLite engine under concurrent threads.
+
+    python -m benchmarks.sqlite_concurrency                     # 8 writers, 16 readers, 15 s per mode
+    python -m benchmarks.sqlite_concurrency --writers 4 --readers 32 --duration 30
+
+Runs the same workload against two engines over a fresh database file:
+
+* ``default`` — the former fallback, ``create_engine(url, check_same_thread=False)``
+  (rollback journal: readers and the writer block each other)
+* ``tuned``   — ``app.database``'s SQLite engine (WAL, synchronous=NORMAL,
+  mmap/cache pragmas, busy timeout, pooled reader connections)
+
+Writers mimic a create-experiment request: look up the user, insert an
+experiment, commit. Readers mimic a list-experiments request for a random
+project. Failed operations (e.g. "database is locked") are counted, not
+retried. The threads share one GIL, as one app worker's threadpool does, so
+the numbers are per worker process.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from .micro import BACKEND_DIR, LOG_TEXT
+from .stats import print_table, summarize, write_results
+
+PROJECTS = 200
+
+
+def _setup(url: str) -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.database import Base
+    from app.models import Experiment, Project, User
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(User(id=1, name="Bench", email="bench@example.org", password_hash="x"))
+        db.add_all(
+            Project(id=i, user_id=1, title=f"Project {i}", description=LOG_TEXT[:200])
+            for i in range(1, PROJECTS + 1)
+        )
+        db.add_all(
+            Experiment(project_id=i % PROJECTS + 1, title=f"Assay {i}", log_text=LOG_TEXT[:400])
+            for i in range(PROJECTS * 20)
+        )
+        db.commit()
+    engine.dispose()
+
+
+def _run(bind, writers: int, readers: int, duration: float) -> dict:
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session
+    from app.models import Experiment, User
+
+    stop = threading.Event()
+    samples = {"write": [], "read": []}
+    errors = {"write": 0, "read": 0}
+    lock = threading.Lock()
+
+    def write(rng):
+        with Session(bind) as db:
+            user = db.get(User, 1)
+            db.add(Experiment(
+                project_id=rng.randint(1, PROJECTS), title=f"Bench by {user.id}",
+                log_text=LOG_TEXT[:400], results_text="ok",
+            ))
+            db.commit()
+
+    def read(rng):
+        with Session(bind) as db:
+            db.execute(
+                select(Experiment)
+                .where(Experiment.project_id == rng.randint(1, PROJECTS))
+                .order_by(Experiment.created_at.desc())
+            ).scalars().all()
+
+    def worker(kind, op, seed):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                op(rng)
+            except Exception:
+                with lock:
+                    errors[kind] += 1
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                samples[kind].append(elapsed)
+
+    threads = [threading.Thread(target=worker, args=("write", write, i)) for i in range(writers)]
+    threads += [threading.Thread(target=worker, args=("read", read, 1000 + i)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    results = {}
+    for kind in ("write", "read"):
+        results[kind] = {
+            **summarize(samples[kind]),
+            "ops_per_sec": round(len(samples[kind]) / duration, 1),
+            "errors": errors[kind],
+        }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per mode")
+    parser.add_argument("--modes", default="default,tuned")
+    parser.add_argument("--out", default="benchmarks/results/sqlite_concurrency.json")
+    args = parser.parse_args()
+
+    out = Path(args.out).resolve()
+    os.chdir(tempfile.mkdtemp(prefix="bench-sqlite-"))
+    os.environ["MYSQL_HOST"] = ""
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from sqlalchemy import create_engine
+    from app.database import _sqlite_engine
+
+    results = {}
+    for mode in args.modes.split(","):
+        path = Path(f"{mode}.db").resolve()
+        url = f"sqlite:///{path}"
+        if mode == "default":
+            engine = create_engine(url, connect_args={"check_same_thread": False})
+        elif mode == "tuned":
+            engine = _sqlite_engine(url)
+            # WAL is a property of the file, so switch to it before seeding
+            engine.connect().close()
+        else:
+            parser.error(f"unknown mode {mode!r}")
+        _setup(url)
+        print(f"running {mode} ({args.writers} writers, {args.readers} readers, "
+              f"{args.duration:g}s)...", file=sys.stderr)
+        for kind, metrics in _run(engine, args.writers, args.readers, args.duration).items():
+            results[f"{mode}_{kind}"] = metrics
+        engine.dispose()
+
+    print_table(results, ["ops_per_sec", "errors", "p50_ms", "p95_ms", "p99_ms"])
+    write_results(
+        out, results, benchmark="sqlite_concurrency",
+        writers=args.writers, readers=args.readers, duration_s=args.duration,
+    )
+    print(f"\nResults written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Shared result handling for the benchmark scripts.
+
+Every benchmark writes the same JSON shape so results can be diffed across
+commits with ``python -m benchmarks.compare``::
+
+    {"meta": {...}, "results": {"<name>": {"<metric>": value, ...}}}
+
+Metric names carry their direction: ``*_ms`` / ``*_s`` are lower-is-better,
+``*_per_sec`` / ``*_rps`` are higher-is-better. Anything else, and the single
+worst sample ``max_ms``, is informative and never flagged as a regression.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+LOWER_IS_BETTER = ("_ms", "_s")
+HIGHER_IS_BETTER = ("_per_sec", "_rps")
+NOT_COMPARED = {"max_ms"}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100
+    lo = int(rank)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (rank - lo)
+
+
+def summarize(samples_s: list[float]) -> dict:
+    """Summarize latency samples (seconds) into millisecond percentiles."""
+    values = sorted(s * 1000 for s in samples_s)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 3),
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def build_meta(**extra) -> dict:
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        **extra,
+    }
+
+
+def write_results(path: str | Path, results: dict, **meta) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"meta": build_meta(**meta), "results": results}
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+def load_results(path: str | Path) -> dict:
+    return json.loads(Path(path).read_text())["results"]
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.10) -> list[str]:
+    """Return a human-readable line for every metric that regressed beyond
+    ``tolerance`` (a fraction, e.g. 0.10 for 10%)."""
+    regressions = []
+    for name, base_metrics in baseline.items():
+        cur_metrics = current.get(name)
+        if cur_metrics is None:
+            continue
+        for metric, base in base_metrics.items():
+            if metric in NOT_COMPARED:
+                continue
+            cur = cur_metrics.get(metric)
+            if not isinstance(base, (int, float)) or not isinstance(cur, (int, float)) or not base:
+                continue
+            change = (cur - base) / base
+            if metric.endswith(LOWER_IS_BETTER) and change > tolerance:
+                regressions.append(f"{name}.{metric}: {base:g} -> {cur:g} (+{change:.0%})")
+            elif metric.endswith(HIGHER_IS_BETTER) and change < -tolerance:
+                regressions.append(f"{name}.{metric}: {base:g} -> {cur:g} ({change:.0%})")
+    return regressions
+
+
+def print_table(results: dict, columns: list[str]) -> None:
+    width = max((len(name) for name in results), default=10) + 2
+    col_widths = [max(12, len(c) + 2) for c in columns]
+    print("".ljust(width) + "".join(c.rjust(w) for c, w in zip(columns, col_widths)))
+    for name, metrics in results.items():
+        row = name.ljust(width)
+        for col, w in zip(columns, col_widths):
+            value = metrics.get(col, "")
+            if isinstance(value, float):
+                value = f"{value:.4f}" if abs(value) < 1 else f"{value:.2f}"
+            row += str(value).rjust(w)
+        print(row)
+    sys.stdout.flush()
@@ -0,0 +1,291 @@
+"""Local stand-ins for the app's external dependencies.
+
+``install()`` swaps the Groq LLM, the Pinecone vector store (one per
+namespace) and the Redis chat history for in-process fakes so the real
+routers and services can be driven offline. The database needs no stand-in: leaving ``MYSQL_HOST`` unset makes
+``app.database`` fall back to SQLite.
+"""
+import asyncio
+import hashlib
+import random
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional
+
+import numpy as np
+from langchain_core.chat_history import InMemoryChatMessageHistory
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.vectorstores import VectorStore
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbeddings(Embeddings):
+    """Feature-hashed bag of words, L2-normalised.
+
+    Cheap and deterministic, and unlike random vectors it still ranks texts
+    that share words as similar, so retrieval results stay meaningful.
+    """
+
+    def __init__(self, size: int = 384):
+        self.size = size
+
+    def _embed(self, text: str) -> list[float]:
+        vec = np.zeros(self.size, dtype=np.float32)
+        for token in _TOKEN_RE.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.size
+            vec[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vec)
+        return (vec / norm if norm else vec).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+def _matches(metadata: dict, filter: Optional[dict]) -> bool:
+    """Evaluate the subset of Pinecone's metadata filter syntax the app uses."""
+    if not filter:
+        return True
+    for key, cond in filter.items():
+        value = metadata.get(key)
+        if isinstance(cond, dict):
+            if "$eq" in cond and value != cond["$eq"]:
+                return False
+            if "$in" in cond and value not in cond["$in"]:
+                return False
+            if "$ne" in cond and value == cond["$ne"]:
+                return False
+            if "$nin" in cond and value in cond["$nin"]:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+class LocalVectorStore(VectorStore):
+    """Brute-force cosine search over an in-memory matrix, standing in for
+    ``PineconeVectorStore`` (same add/delete/search surface and filter syntax)."""
+
+    def __init__(self, embedding: Embeddings):
+        self._embedding = embedding
+        self._lock = threading.Lock()
+        self._ids: list[str] = []
+        self._texts: list[str] = []
+        self._metadatas: list[dict] = []
+        self._vectors: list[list[float]] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[list[dict]] = None,
+        ids: Optional[list[str]] = None,
+        **kwargs: Any,
+    ) -> list[str]:
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [hashlib.sha1(t.encode()).hexdigest() for t in texts]
+        self._write(ids, texts, metadatas, self._embedding.embed_documents(texts))
+        return ids
+
+    @property
+    def index(self) -> "_LocalIndex":
+        return _LocalIndex(self)
+
+    def _write(self, ids: list[str], texts: list[str], metadatas: list[dict], vectors: list[list[float]]) -> None:
+        with self._lock:
+            positions = {doc_id: i for i, doc_id in enumerate(self._ids)}
+            for doc_id, text, meta, vec in zip(ids, texts, metadatas, vectors):
+                if doc_id in positions:
+                    i = positions[doc_id]
+                    self._texts[i], self._metadatas[i], self._vectors[i] = text, meta, vec
+                else:
+                    positions[doc_id] = len(self._ids)
+                    self._ids.append(doc_id)
+                    self._texts.append(text)
+                    self._metadatas.append(meta)
+                    self._vectors.append(vec)
+            self._matrix = None
+
+    def delete(self, ids: Optional[list[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if not ids:
+            return False
+        drop = set(ids)
+        with self._lock:
+            keep = [i for i, doc_id in enumerate(self._ids) if doc_id not in drop]
+            self._ids = [self._ids[i] for i in keep]
+            self._texts = [self._texts[i] for i in keep]
+            self._metadatas = [self._metadatas[i] for i in keep]
+            self._vectors = [self._vectors[i] for i in keep]
+            self._matrix = None
+        return True
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: list[float], k: int = 4, filter: Optional[dict] = None, **kwargs: Any
+    ) -> list[tuple[Document, float]]:
+        with self._lock:
+            if not self._ids:
+                return []
+            if self._matrix is None:
+                self._matrix = np.asarray(self._vectors, dtype=np.float32)
+            scores = self._matrix @ np.asarray(embedding, dtype=np.float32)
+            candidates = [i for i in np.argsort(-scores) if _matches(self._metadatas[i], filter)]
+            return [
+                (Document(page_content=self._texts[i], metadata=self._metadatas[i], id=self._ids[i]),
+                 float(scores[i]))
+                for i in candidates[:k]
+            ]
+
+    def similarity_search_by_vector(
+        self, embedding: list[float], k: int = 4, filter: Optional[dict] = None, **kwargs: Any
+    ) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, filter)]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs: Any
+    ) -> list[tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(
+            self._embedding.embed_query(query), k, filter
+        )
+
+    def similarity_search(
+        self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs: Any
+    ) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: list[str],
+        embedding: Embeddings,
+        metadatas: Optional[list[dict]] = None,
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        store = cls(embedding)
+        store.add_texts(texts, metadatas, ids=kwargs.get("ids"))
+        return store
+
+
+class _LocalIndex:
+    """The slice of a Pinecone ``Index`` the app writes through directly:
+    ``upsert`` of ``(id, vector, metadata)`` records, text in ``metadata["text"]``."""
+
+    def __init__(self, store: LocalVectorStore):
+        self._store = store
+
+    def upsert(self, vectors: list[tuple], namespace: Optional[str] = None, **kwargs: Any) -> dict:
+        ids, values, metadatas = (list(column) for column in zip(*vectors)) if vectors else ([], [], [])
+        metadatas = [dict(meta) for meta in metadatas]
+        texts = [meta.pop("text", "") for meta in metadatas]
+        self._store._write(ids, texts, metadatas, values)
+        return {"upserted_count": len(ids)}
+
+
+class FakeStreamingChatModel(BaseChatModel):
+    """Chat model that streams canned tokens with configurable latency.
+
+    ``first_token_latency`` models queueing + prompt processing upstream,
+    ``token_latency`` the inter-token gap while decoding. With probability
+    ``stall_rate`` a stream waits ``stall_latency`` for its first token
+    instead, modelling an upstream latency spike.
+    """
+
+    model_name: str = "fake"
+    first_token_latency: float = 0.3
+    stall_rate: float = 0.0
+    stall_latency: float = 10.0
+    token_latency: float = 0.02
+    tokens: int = 60
+    reply: str = "Based on the retrieved experiment logs the assay results look consistent"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-streaming"
+
+    def _chunks(self) -> Iterator[str]:
+        words = self.reply.split()
+        for i in range(self.tokens):
+            yield words[i % len(words)] + " "
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.first_token_latency + self.token_latency * self.tokens)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(self._chunks())))])
+
+    async def _agenerate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.first_token_latency + self.token_latency * self.tokens)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(self._chunks())))])
+
+    async def _astream(
+        self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        stalled = self.stall_rate and random.random() < self.stall_rate
+        await asyncio.sleep(self.stall_latency if stalled else self.first_token_latency)
+        for i, token in enumerate(self._chunks()):
+            if i:
+                await asyncio.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def install(
+    first_token_latency: float = 0.3,
+    token_latency: float = 0.02,
+    tokens: int = 60,
+    embedding_size: int = 384,
+    stall_rate: float = 0.0,
+    stall_latency: float = 10.0,
+    backends: int = 1,
+) -> LocalVectorStore:
+    """Patch the app's service modules to use the local stand-ins.
+
+    Must run after ``app`` is importable but before the first request; the
+    routers resolve these module attributes at call time. Only the primary
+    of ``backends`` fake LLMs stalls, so hedging onto the others can be
+    measured.
+    """
+    from app.services import chat_service, pinecone_service
+
+    store = LocalVectorStore(HashingEmbeddings(embedding_size))
+    namespaces: dict[Optional[str], LocalVectorStore] = {None: store}
+
+    def get_vector_store(namespace: Optional[str] = None) -> LocalVectorStore:
+        if namespace not in namespaces:
+            namespaces[namespace] = LocalVectorStore(store.embeddings)
+        return namespaces[namespace]
+
+    pinecone_service.get_embeddings = lambda: store.embeddings
+    pinecone_service.get_vector_store = get_vector_store
+
+    chat_service.answer_llms = [
+        FakeStreamingChatModel(
+            model_name=f"fake-{i}",
+            first_token_latency=first_token_latency,
+            token_latency=token_latency,
+            tokens=tokens,
+            stall_rate=stall_rate if i == 0 else 0.0,
+            stall_latency=stall_latency,
+        )
+        for i in range(backends)
+    ]
+    chat_service.contextualize_llms = chat_service.answer_llms
+
+    histories: dict[str, InMemoryChatMessageHistory] = {}
+    chat_service._get_history = lambda session_id: histories.setdefault(
+        session_id, InMemoryChatMessageHistory()
+    )
+    return store
@@ -0,0 +1,64 @@
+"""Embed a summary vector for every existing project (two-stage retrieval).
+
+    python -m scripts.backfill_project_summaries               # all projects
+    python -m scripts.backfill_project_summaries --dry-run     # print the first summary only
+    python -m scripts.backfill_project_summaries --start-after 1200   # resume after project 1200
+
+Run from ``backend/`` so the usual ``.env`` is read. The routers keep
+summaries current after each write; this only seeds projects that were last
+written before summaries existed, and is safe to re-run (upserts by id).
+Until it has run, chat falls back to a flat search. Writes go through the
+app's Pinecone breaker and timeout; if a batch fails the run stops and
+prints the ``--start-after`` to resume from.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=100, help="projects per embedding/upsert batch")
+    parser.add_argument("--dry-run", action="store_true", help="print the first summary and exit")
+    parser.add_argument("--start-after", type=int, default=0, help="skip projects up to and including this id")
+    args = parser.parse_args()
+    return asyncio.run(backfill(args))
+
+
+async def backfill(args: argparse.Namespace) -> int:
+    from app.config import settings
+    from app.database import SessionLocal
+    from app.models.project import Project
+    from app.services.pinecone_service import upsert_texts
+    from app.services.retrieval_service import summary_documents
+
+    started = time.perf_counter()
+    done = 0
+    with SessionLocal() as db:
+        project_ids = [
+            pid for (pid,) in db.query(Project.id).filter(Project.id > args.start_after).order_by(Project.id)
+        ]
+        for start in range(0, len(project_ids), args.batch_size):
+            batch = project_ids[start:start + args.batch_size]
+            documents, _ = summary_documents(db, batch)
+            if args.dry_run:
+                print(f"{len(project_ids)} projects; first summary:\n")
+                print(documents[0][0] if documents else "(none)")
+                return 0
+            if documents and not await upsert_texts(documents, namespace=settings.PINECONE_SUMMARY_NAMESPACE):
+                resume = project_ids[start - 1] if start else args.start_after
+                print(
+                    f"Batch of projects {batch[0]}-{batch[-1]} failed after {done} summaries; "
+                    f"resume with --start-after {resume}",
+                    file=sys.stderr,
+                )
+                return 1
+            done += len(documents)
+            print(f"{done}/{len(project_ids)} summaries upserted", file=sys.stderr)
+    print(f"Backfilled {done} project summaries in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
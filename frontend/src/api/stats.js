@@ -0,0 +1,5 @@
+import client from './client'
+
+export const statsAPI = {
+  get: () => client.get('/stats'),
+}
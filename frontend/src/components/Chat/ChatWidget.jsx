@@ -57,6 +57,13 @@ function Message({ msg }) {
         {msg.content || (
           <span className="italic opacity-60 text-xs">Thinking…</span>
         )}
+        {msg.degraded && (
+          <p className="mt-1.5 text-xs text-amber-600">
+            {msg.degraded.includes('retrieval')
+              ? 'The knowledge base is temporarily unavailable; this answer does not draw on it.'
+              : 'Earlier messages are temporarily unavailable; this answer may miss context.'}
+          </p>
+        )}
       </div>
     </div>
   )
@@ -3,7 +3,7 @@ import { FlaskConical, ArrowRight, Calendar, Edit2, Trash2 } from 'lucide-react'
 import Badge from '../UI/Badge'
 import { useAuth } from '../../context/AuthContext'
 
-export default function ProjectCard({ project, onEdit, onDelete }) {
+export default function ProjectCard({ project, experimentCount, onEdit, onDelete }) {
   const navigate = useNavigate()
   const { user } = useAuth()
   const canModify = user?.role === 'admin' || user?.id === project.user_id
@@ -29,9 +29,17 @@ export default function ProjectCard({ project, onEdit, onDelete }) {
 
       {/* Footer */}
       <div className="flex items-center justify-between pt-2 border-t border-gray-100">
-        <div className="flex items-center gap-1.5 text-xs text-gray-400">
-          <Calendar size={12} />
-          {formatDate(project.created_at)}
+        <div className="flex items-center gap-3 text-xs text-gray-400">
+          <span className="flex items-center gap-1.5">
+            <Calendar size={12} />
+            {formatDate(project.created_at)}
+          </span>
+          {experimentCount !== undefined && (
+            <span className="flex items-center gap-1.5">
+              <FlaskConical size={12} />
+              {experimentCount} experiment{experimentCount !== 1 ? 's' : ''}
+            </span>
+          )}
         </div>
 
         <div className="flex items-center gap-1">
@@ -50,6 +50,16 @@ export function useChat() {
 
           try {
             const parsed = JSON.parse(data)
+            if (parsed.degraded) {
+              // Answer produced without chat history and/or knowledge-base retrieval
+              setMessages((prev) => {
+                const updated = [...prev]
+                const last = { ...updated[updated.length - 1] }
+                last.degraded = parsed.degraded
+                updated[updated.length - 1] = last
+                return updated
+              })
+            }
             if (parsed.content) {
               setMessages((prev) => {
                 const updated = [...prev]
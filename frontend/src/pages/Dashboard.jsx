@@ -7,6 +7,7 @@ import ProjectCard from '../components/Projects/ProjectCard'
 import ProjectForm from '../components/Projects/ProjectForm'
 import ConfirmDialog from '../components/UI/ConfirmDialog'
 import { projectsAPI } from '../api/projects'
+import { statsAPI } from '../api/stats'
 import { useAuth } from '../context/AuthContext'
 
 function StatCard({ icon: Icon, label, value, color }) {
@@ -26,6 +27,7 @@ function StatCard({ icon: Icon, label, value, color }) {
 export default function Dashboard() {
   const { user } = useAuth()
   const [projects, setProjects] = useState([])
+  const [serverStats, setServerStats] = useState(null)
   const [filtered, setFiltered] = useState([])
   const [search, setSearch] = useState('')
   const [statusFilter, setStatusFilter] = useState('all')
@@ -46,7 +48,17 @@ export default function Dashboard() {
     }
   }, [])
 
+  // Counts come from the server so they don't depend on the loaded project list
+  const fetchStats = useCallback(async () => {
+    try {
+      setServerStats(await statsAPI.get())
+    } catch {
+      // Non-critical: the cards fall back to zero
+    }
+  }, [])
+
   useEffect(() => { fetchProjects() }, [fetchProjects])
+  useEffect(() => { fetchStats() }, [fetchStats])
 
   useEffect(() => {
     let result = projects
@@ -64,6 +76,7 @@ export default function Dashboard() {
     try {
       const created = await projectsAPI.create(form)
       setProjects((p) => [created, ...p])
+      fetchStats()
       toast.success('Project created and indexed')
     } catch (err) {
       toast.error(typeof err === 'string' ? err : 'Failed to create project')
@@ -75,6 +88,7 @@ export default function Dashboard() {
     try {
       const updated = await projectsAPI.update(editTarget.id, form)
       setProjects((p) => p.map((x) => (x.id === updated.id ? updated : x)))
+      fetchStats()
       toast.success('Project updated')
       setEditTarget(null)
     } catch (err) {
@@ -88,6 +102,7 @@ export default function Dashboard() {
     try {
       await projectsAPI.delete(deleteTarget.id)
       setProjects((p) => p.filter((x) => x.id !== deleteTarget.id))
+      fetchStats()
       toast.success('Project deleted')
       setDeleteTarget(null)
     } catch {
@@ -98,9 +113,9 @@ export default function Dashboard() {
   }
 
   const stats = {
-    total: projects.length,
-    active: projects.filter((p) => p.status === 'active').length,
-    completed: projects.filter((p) => p.status === 'completed').length,
+    total: serverStats?.total_projects ?? 0,
+    active: serverStats?.projects_by_status.active ?? 0,
+    completed: serverStats?.projects_by_status.completed ?? 0,
   }
 
   return (
@@ -200,6 +215,7 @@ export default function Dashboard() {
                 <ProjectCard
                   key={project.id}
                   project={project}
+                  experimentCount={serverStats ? serverStats.experiments_per_project[project.id] ?? 0 : undefined}
                   onEdit={(p) => { setEditTarget(p); setFormOpen(true) }}
                   onDelete={(p) => setDeleteTarget(p)}
                 />